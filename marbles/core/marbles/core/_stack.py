@@ -21,7 +21,6 @@
 #
 
 import sys
-import traceback
 
 
 def get_stack_info():
@@ -29,18 +28,23 @@ def get_stack_info():
     stacktrace to provide the source of the assertion error and
     formatted note.
     '''
-    stack = traceback.walk_stack(sys._getframe().f_back)
+    frame = sys._getframe(1)
 
     # We want locals from the test definition (which always begins
     # with 'test_' in unittest), which will be at a different
     # level in the stack depending on how many tests are in each
     # test case, how many test cases there are, etc.
 
+    # We walk the frames directly rather than using
+    # traceback.walk_stack, which would wrap each one in a tuple for
+    # no benefit here.
+
     # The branch where we exhaust this loop is not covered
     # because we always find a test.
-    for frame, _ in stack:  # pragma: no branch
+    while frame is not None:  # pragma: no branch
         code = frame.f_code
         func_name = code.co_name
         if func_name.startswith('test_') or func_name in {'setUp', 'tearDown'}:
             return (frame.f_locals.copy(), frame.f_globals['__name__'],
                     code.co_filename, frame.f_lineno)
+        frame = frame.f_back
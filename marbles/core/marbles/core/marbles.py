@@ -54,7 +54,6 @@ import ast
 import collections.abc
 import functools
 import inspect
-import itertools
 import linecache
 import logging
 import re
@@ -247,7 +246,7 @@ Source ({filename}):
 
         super(ContextualAssertionError, self).__init__(self.formattedMsg)
 
-    @property
+    @functools.cached_property
     def note(self):
         if self._note is None:
             return None
@@ -290,7 +289,7 @@ Source ({filename}):
     def linenumber(self):
         return self._linenumber
 
-    @property
+    @functools.cached_property
     def assert_stmt(self):
         '''Returns a string displaying the whole statement that failed,
         with a '>' indicator on the line starting the expression.
@@ -310,28 +309,32 @@ Source ({filename}):
         module_globals = vars(sys.modules[self.module])
         line_range, lineno = self._find_assert_stmt(
             self.filename, self.linenumber, module_globals=module_globals)
-        source = [linecache.getline(self.filename, x,
-                                    module_globals=module_globals)
+        # _find_assert_stmt has already loaded the file into linecache,
+        # so fetch its lines once rather than going through
+        # linecache.getline for every line we display.
+        lines = linecache.getlines(self.filename,
+                                   module_globals=module_globals)
+        source = [lines[x - 1] if 1 <= x <= len(lines) else ''
                   for x in line_range]
 
         # Dedent the source, removing the final newline added by dedent
         dedented_lines = textwrap.dedent(''.join(source)).split('\n')[:-1]
 
-        formatted_lines = []
-        for i, line in zip(line_range, dedented_lines):
-            prefix = '>' if i == lineno else ' '
-            formatted_lines.append(' {0} {1:4d} {2}'.format(prefix, i, line))
+        formatted_lines = [
+            f' {">" if i == lineno else " "} {i:4d} {line}'
+            for i, line in zip(line_range, dedented_lines)]
 
         return '\n'.join(formatted_lines)
 
-    @property
+    @functools.cached_property
     def formattedMsg(self):  # mimic unittest's name for standardMsg
         fmt = self._META_FORMAT_STRING
-        if self.public_test_locals:
+        public_test_locals = self.public_test_locals
+        if public_test_locals:
             fmt += self._LOCALS_META_FORMAT_STRING
         if self.note:
             fmt += self._NOTE_META_FORMAT_STRING
-        local_string = self._format_locals(self.public_test_locals)
+        local_string = self._format_locals(public_test_locals)
         return fmt.format(
             standardMsg=self.standardMsg, assert_stmt=self.assert_stmt,
             note=self.note, locals=local_string, filename=self.filename)
@@ -373,7 +376,8 @@ Source ({filename}):
         lines = linecache.getlines(
             filename, module_globals=module_globals)
         _source = ''.join(lines)
-        _tree = ast.parse(_source)
+        _tree = ast.parse(_source, filename=filename, type_comments=False,
+                          feature_version=sys.version_info[:2])
 
         finder = _StatementFinder(linenumber)
         finder.visit(_tree)
@@ -405,12 +409,11 @@ class AnnotationContext(object):
 
     def _validate_annotation(self, annotation):
         '''Ensures that the annotation has the right fields.'''
-        required_keys = set(self._required_keys)
-        keys = set(key for key, val in annotation.items() if val)
-        missing_keys = required_keys.difference(keys)
+        missing_keys = [key for key in self._required_keys
+                        if not annotation.get(key)]
         if missing_keys:
             error = 'Annotation missing required fields: {0}'.format(
-                missing_keys)
+                set(missing_keys))
             raise AnnotationError(error)
 
     def __enter__(self):
@@ -420,6 +423,9 @@ class AnnotationContext(object):
             annotation = self._msg
         else:
             annotation = {'msg': self._msg, 'note': note}
+        # If we're nested inside another assertion, its annotation
+        # has already been validated and we inherit its note, so
+        # there's nothing left to check.
         if not current_note:
             self._validate_annotation(annotation)
         setattr(self, '_old_note', current_note)
@@ -449,19 +455,14 @@ def _find_msg_argument(signature):
         The index of the ``msg`` param, the default value for it,
         and the number of non-``msg`` positional parameters we expect.
     '''
-    names = signature.parameters.keys()
-    try:
-        msg_idx = list(names).index('msg')
-        default_msg = signature.parameters['msg'].default
-    except ValueError:  # 'msg' is not in list
-        # It's likely that this is a custom assertion that's just
-        # passing all remaining args and kwargs through
-        # (e.g. tests.marbles.ReversingTestCaseMixin). Unfortunately,
-        # we can't inspect its code to find the assert it's wrapping,
-        # so we just have to assume it's of the standard form with msg
-        # in the last position with a default of None.
-        msg_idx = -1
-        default_msg = None
+    # It's likely that, if there's no 'msg' parameter, this is a
+    # custom assertion that's just passing all remaining args and
+    # kwargs through (e.g. tests.marbles.ReversingTestCaseMixin).
+    # Unfortunately, we can't inspect its code to find the assert it's
+    # wrapping, so we just have to assume it's of the standard form
+    # with msg in the last position with a default of None.
+    msg_idx = -1
+    default_msg = None
 
     # We also don't want to steal any actually positional arguments if
     # we can help it. Therefore, we leave the default msg if there are
@@ -470,10 +471,18 @@ def _find_msg_argument(signature):
     # parameter.
     kinds = (inspect.Parameter.POSITIONAL_ONLY,
              inspect.Parameter.POSITIONAL_OR_KEYWORD)
-    non_msg_params = itertools.takewhile(
-        lambda param: param.name != 'msg' and param.kind in kinds,
-        signature.parameters.values())
-    non_msg_params = sum(1 for _ in non_msg_params)
+    non_msg_params = 0
+    counting = True
+
+    for idx, param in enumerate(signature.parameters.values()):
+        if param.name == 'msg':
+            msg_idx = idx
+            default_msg = param.default
+            break
+        if counting and param.kind in kinds:
+            non_msg_params += 1
+        else:
+            counting = False
     return msg_idx, default_msg, non_msg_params
 
 
@@ -542,8 +551,15 @@ class TestCase(unittest.TestCase):
 
         @functools.wraps(attr)
         def wrapper(*args, **kwargs):
-            msg, args, rem_args, kwargs = _extract_msg(
-                args, kwargs, msg_idx, default_msg, non_msg_params)
+            if len(args) > non_msg_params:
+                msg, args, rem_args, kwargs = _extract_msg(
+                    args, kwargs, msg_idx, default_msg, non_msg_params)
+            else:
+                # Nothing could have been passed positionally as msg,
+                # which is by far the most common way assertions are
+                # called, so we can skip the extraction entirely.
+                msg = kwargs.pop('msg', default_msg)
+                rem_args = ()
 
             note = kwargs.pop('note', None)
 
@@ -257,9 +257,10 @@ class MainWithErrorTestCase(TestScriptRunningTestCase):
 class VersionTestCase(CommandRunningTestCase):
     '''Test that marbles --version works.'''
 
-    def __init__(self, methodName='runTest'):  # noqa: D102
+    def __init__(self, methodName='runTest', *, cwd=None):  # noqa: D102
         super().__init__(methodName=methodName,
-                         cmd=[sys.executable, '-m', 'marbles', '--version'])
+                         cmd=[sys.executable, '-m', 'marbles', '--version'],
+                         cwd=cwd)
 
     def test_stdout(self):
         '''The version output should contain marbles.core's version.'''
@@ -271,6 +272,20 @@ class VersionTestCase(CommandRunningTestCase):
         self.assertEqual('', self.stderr)
 
 
+class RepoRootVersionTestCase(VersionTestCase):
+    '''Test that marbles --version works from the repository root.
+
+    There, the ``marbles/`` directory holding the subpackage projects
+    is on ``sys.path`` too, and must not shadow the installed
+    :mod:`marbles.core` and :mod:`marbles.mixins` packages.
+    '''
+
+    def __init__(self, methodName='runTest'):  # noqa: D102
+        repo_root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))))
+        super().__init__(methodName=methodName, cwd=repo_root)
+
+
 def load_tests_from_testcase(loader, class_, test_files):
     '''Load and parametrize tests for ``class_``.'''
     runners = [
@@ -302,6 +317,9 @@ def load_tests(loader, tests, pattern):  # noqa: D103
 
     suite.addTests(VersionTestCase(methodName=test_name)
                    for test_name in loader.getTestCaseNames(VersionTestCase))
+    suite.addTests(
+        RepoRootVersionTestCase(methodName=test_name)
+        for test_name in loader.getTestCaseNames(RepoRootVersionTestCase))
 
     return suite
 
@@ -23,5 +23,7 @@
 import os.path
 
 
-with open(os.path.join(os.path.dirname(__file__), 'VERSION')) as vfile:
-    __version__ = vfile.read().strip()
+# Read the version in binary mode: it's ASCII, so there's no need to
+# set up a text decoder (or look up the locale's encoding) for it
+with open(os.path.join(os.path.dirname(__file__), 'VERSION'), 'rb') as vfile:
+    __version__ = vfile.read().decode('ascii').strip()
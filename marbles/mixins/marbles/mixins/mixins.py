@@ -67,16 +67,208 @@ Example:
 '''
 
 import abc
-import collections.abc
+import contextlib
 import operator
 import os
+import stat
+import sys
 from datetime import date, datetime, timedelta, timezone
-
-import pandas as pd
+from itertools import repeat
 
 # TODO (jsa): override abc TypeError to inform user that they have to
 # inherit from unittest.TestCase (I don't know if this is possible)
 
+# Comparison operators, bound once at import time
+_LT, _LE, _GT, _GE = operator.lt, operator.le, operator.gt, operator.ge
+
+# Number of elements compared at a time when checking numpy arrays
+_ARRAY_CHUNK_SIZE = 1 << 16
+
+# Only Windows fills in file sizes while listing a directory; on other
+# platforms DirEntry.stat() costs the same stat call as os.stat(), so
+# scanning the directory would only add work
+_SCANDIR_SIZES = os.name == 'nt'
+_SCANDIR_MIN_FILES = 4
+
+
+def _as_array(obj, kinds):
+    '''Return ``obj`` as a one-dimensional :class:`numpy.ndarray` if
+    it is an array, :class:`pandas.Series`, or :class:`pandas.Index`
+    whose dtype kind is one of ``kinds``, otherwise return None.
+    '''
+    # We look numpy and pandas up instead of importing them: if they
+    # haven't been imported, obj can't be one of their types
+    np = sys.modules.get('numpy')
+    if np is None:
+        return None
+    if not isinstance(obj, np.ndarray):
+        pd = sys.modules.get('pandas')
+        if pd is None or not isinstance(obj, (pd.Series, pd.Index)):
+            return None
+        obj = obj.to_numpy()
+    if obj.ndim != 1 or obj.dtype.kind not in kinds:
+        return None
+    return obj
+
+
+def _as_array_bound(arr, bound):
+    '''Return ``bound`` converted so that it compares elementwise
+    with ``arr``. numpy won't compare datetime64 or timedelta64
+    elements to :class:`datetime` or :class:`timedelta` objects, so
+    those are converted to the array's own type; anything else is
+    returned unchanged.
+
+    Raises
+    ------
+    TypeError
+        If ``bound`` is a timezone-aware :class:`datetime` and ``arr``
+        holds (naive) datetime64 values.
+    '''
+    kind = arr.dtype.kind
+    if kind == 'M' and isinstance(bound, datetime):
+        if bound.tzinfo is not None:
+            raise TypeError('cannot compare timezone-aware bound %s with '
+                            'naive datetime64 elements' % bound)
+        # pandas Timestamps have nanoseconds that datetime64() drops
+        convert = getattr(bound, 'to_datetime64', None)
+    elif kind == 'm' and isinstance(bound, timedelta):
+        # Likewise for pandas Timedeltas and timedelta64()
+        convert = getattr(bound, 'to_timedelta64', None)
+    else:
+        return bound
+    if convert is not None:
+        return convert()
+    return arr.dtype.type(bound)
+
+
+def _array_between(arr, lower, upper, op):
+    '''Return a boolean array of whether ``op(lower, elem)`` and
+    ``op(elem, upper)`` both hold for each element of ``arr``.
+    '''
+    lower = _as_array_bound(arr, lower)
+    upper = _as_array_bound(arr, upper)
+    return op(lower, arr) & op(arr, upper)
+
+
+def _format_positions(mask):
+    '''Return the first few positions where ``mask`` is true, for
+    use in a failure message.
+    '''
+    found = mask.nonzero()[0]
+    positions = ', '.join(str(i) for i in found[:5])
+    if len(found) > 5:
+        positions += ', ...'
+    return positions
+
+
+# Common containers, which can be recognised as iterable without
+# building an iterator
+_ITERABLE_TYPES = (list, tuple, set, frozenset, dict)
+
+
+def _is_iterable(obj):
+    '''Return whether ``iter(obj)`` would succeed. Unlike checking
+    against :class:`collections.abc.Iterable`, this accepts objects
+    that are only iterable through ``__getitem__``.
+    '''
+    if isinstance(obj, _ITERABLE_TYPES):
+        return True
+    try:
+        iter(obj)
+    except TypeError:
+        return False
+    return True
+
+
+def _compare_datetime64(op, sequence, target):
+    '''If ``sequence`` is a numpy or pandas array of naive datetimes,
+    and ``target`` is either a naive :class:`datetime` or another such
+    array, return whether ``op`` holds elementwise. Otherwise return
+    None.
+    '''
+    arr = _as_array(sequence, 'M')
+    if arr is None:
+        return None
+    if isinstance(target, datetime):
+        if target.tzinfo is not None:
+            return None
+        # pandas Timestamps have nanoseconds that datetime64() drops
+        to_datetime64 = getattr(target, 'to_datetime64', None)
+        if to_datetime64 is not None:
+            target = to_datetime64()
+        else:
+            target = arr.dtype.type(target)
+    else:
+        target = _as_array(target, 'M')
+        if target is None:
+            return None
+    return bool(op(arr, target).all())
+
+
+def _now_like(obj):
+    '''Return the current datetime if ``obj`` is a :class:`datetime`,
+    or today's date if it is a :class:`date`.
+
+    Raises
+    ------
+    TypeError
+        If ``obj`` is neither a datetime nor a date.
+    '''
+    # Cannot compare datetime to date, so if dates are provided use
+    # date.today(), if datetimes are provided use datetime.today().
+    # datetime is a subclass of date, so it has to be checked first
+    if isinstance(obj, datetime):
+        return datetime.today()
+    if isinstance(obj, date):
+        return date.today()
+    raise TypeError('Expected iterable of datetime or date objects')
+
+
+# _monotonic's loop written out for each operator, so that the
+# comparison is an inline operator rather than a function call
+def _pairwise_lt(sequence):
+    it = iter(sequence)
+    prev = next(it, None)
+    for elem in it:
+        if not prev < elem:
+            return False
+        prev = elem
+    return True
+
+
+def _pairwise_le(sequence):
+    it = iter(sequence)
+    prev = next(it, None)
+    for elem in it:
+        if not prev <= elem:
+            return False
+        prev = elem
+    return True
+
+
+def _pairwise_gt(sequence):
+    it = iter(sequence)
+    prev = next(it, None)
+    for elem in it:
+        if not prev > elem:
+            return False
+        prev = elem
+    return True
+
+
+def _pairwise_ge(sequence):
+    it = iter(sequence)
+    prev = next(it, None)
+    for elem in it:
+        if not prev >= elem:
+            return False
+        prev = elem
+    return True
+
+
+_PAIRWISE = {_LT: _pairwise_lt, _LE: _pairwise_le,
+             _GT: _pairwise_gt, _GE: _pairwise_ge}
+
 
 class BetweenMixins(abc.ABC):
     '''Built-in assertions about betweenness.'''
@@ -100,6 +292,12 @@ class BetweenMixins(abc.ABC):
         or ``self.assertTrue(lower <= obj <= upper)``, but with a nicer
         default message.
 
+        If ``obj`` is a one-dimensional :class:`numpy.ndarray` or
+        :class:`pandas.Series`, fail unless every element is between
+        ``lower`` and ``upper``; the default message reports which
+        elements are not. A datetime64 array can't be compared with a
+        timezone-aware bound, so that raises :class:`TypeError`.
+
         Parameters
         ----------
         obj
@@ -110,15 +308,24 @@ class BetweenMixins(abc.ABC):
             If not provided, the :mod:`marbles.mixins` or
             :mod:`unittest` standard message will be used.
         '''
-        if strict:
-            standardMsg = '%s is not strictly between %s and %s' % (
-                    obj, lower, upper)
-            op = operator.lt
-        else:
-            standardMsg = '%s is not between %s and %s' % (obj, lower, upper)
-            op = operator.le
+        op = _LT if strict else _LE
+
+        arr = _as_array(obj, 'biufmM')
+        if arr is not None:
+            # Check every element at once instead of asking numpy for
+            # the truth value of an array, which is ambiguous
+            inside = _array_between(arr, lower, upper, op)
+            if not inside.all():
+                kind = 'strictly between' if strict else 'between'
+                positions = _format_positions(~inside)
+                standardMsg = (f'Elements of {obj} at positions {positions} '
+                               f'are not {kind} {lower} and {upper}')
+                self.fail(self._formatMessage(msg, standardMsg))
+            return
 
         if not (op(lower, obj) and op(obj, upper)):
+            kind = 'strictly between' if strict else 'between'
+            standardMsg = f'{obj} is not {kind} {lower} and {upper}'
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertNotBetween(self, obj, lower, upper, strict=True, msg=None):
@@ -131,11 +338,19 @@ class BetweenMixins(abc.ABC):
         or ``self.assertFalse(lower <= obj <= upper)``, but with a
         nicer default message.
 
+        If ``obj`` is a one-dimensional :class:`numpy.ndarray` or
+        :class:`pandas.Series`, fail if any element is between
+        ``lower`` and ``upper``; the default message reports which
+        elements are.
+
         Raises
         ------
         ValueError
             If ``lower`` equals ``upper`` and ``strict=True`` is
             specified.
+        TypeError
+            If ``obj`` is a datetime64 array and ``lower`` or
+            ``upper`` is a timezone-aware :class:`datetime`.
 
         Parameters
         ----------
@@ -147,20 +362,27 @@ class BetweenMixins(abc.ABC):
             If not provided, the :mod:`marbles.mixins` or
             :mod:`unittest` standard message will be used.
         '''
-        if strict:
-            standardMsg = '%s is between %s and %s' % (obj, lower, upper)
-            op = operator.le
-        else:
-            standardMsg = '%s is strictly between %s and %s' % (
-                    obj, lower, upper)
-            op = operator.lt
+        op = _LE if strict else _LT
 
         # Providing strict=False and a degenerate interval should raise
         # ValueError so the test will error instead of fail
         if (not strict) and (lower == upper):
             raise ValueError('cannot specify strict=False if lower == upper')
 
+        arr = _as_array(obj, 'biufmM')
+        if arr is not None:
+            inside = _array_between(arr, lower, upper, op)
+            if inside.any():
+                kind = 'between' if strict else 'strictly between'
+                positions = _format_positions(inside)
+                standardMsg = (f'Elements of {obj} at positions {positions} '
+                               f'are {kind} {lower} and {upper}')
+                self.fail(self._formatMessage(msg, standardMsg))
+            return
+
         if (op(lower, obj) and op(obj, upper)):
+            kind = 'between' if strict else 'strictly between'
+            standardMsg = f'{obj} is {kind} {lower} and {upper}'
             self.fail(self._formatMessage(msg, standardMsg))
 
 
@@ -181,7 +403,24 @@ class MonotonicMixins(abc.ABC):
 
     @staticmethod
     def _monotonic(op, sequence):
-        return all(op(i, j) for i, j in zip(sequence, sequence[1:]))
+        # numpy compares arrays elementwise, so we can compare each
+        # element to the next without leaving C. Complex numbers are
+        # left to the generic path because numpy orders them but
+        # Python does not
+        arr = _as_array(sequence, 'biufmM')
+        if arr is not None:
+            # Compare a chunk at a time so that we can stop early and
+            # never allocate a boolean array as long as the input
+            for start in range(0, len(arr) - 1, _ARRAY_CHUNK_SIZE):
+                stop = min(start + _ARRAY_CHUNK_SIZE, len(arr) - 1)
+                if not op(arr[start:stop], arr[start + 1:stop + 1]).all():
+                    return False
+            return True
+
+        # Walk the sequence once instead of zipping it with a slice of
+        # itself, so we don't copy it and can stop at the first pair
+        # that is out of order
+        return _PAIRWISE[op](sequence)
 
     def assertMonotonicIncreasing(self, sequence, strict=True, msg=None):
         '''Fail if ``sequence`` is not monotonically increasing.
@@ -194,8 +433,8 @@ class MonotonicMixins(abc.ABC):
 
         .. code-block:: python
 
-            assert all((i < j) for i, j in zip(sequence, sequence[1:]))
-            assert all((i <= j) for i, j in zip(sequence, sequence[1:]))
+            assert all((i < j) for i, j in zip(sequence, islice(sequence, 1, None)))
+            assert all((i <= j) for i, j in zip(sequence, islice(sequence, 1, None)))
 
         Parameters
         ----------
@@ -210,19 +449,14 @@ class MonotonicMixins(abc.ABC):
         TypeError
             If ``sequence`` is not iterable.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        if strict:
-            standardMsg = ('Elements in %s are not strictly monotonically '
-                           'increasing') % (sequence,)
-            op = operator.lt
-        else:
-            standardMsg = ('Elements in %s are not monotonically '
-                           'increasing') % (sequence,)
-            op = operator.le
+        op = _LT if strict else _LE
 
         if not self._monotonic(op, sequence):
+            kind = 'strictly monotonically' if strict else 'monotonically'
+            standardMsg = f'Elements in {sequence} are not {kind} increasing'
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertNotMonotonicIncreasing(self, sequence, strict=True, msg=None):
@@ -236,8 +470,8 @@ class MonotonicMixins(abc.ABC):
 
         .. code-block:: python
 
-            assert not all((i < j) for i, j in zip(sequence, sequence[1:]))
-            assert not all((i <= j) for i, j in zip(sequence, sequence[1:]))
+            assert not all((i < j) for i, j in zip(sequence, islice(sequence, 1, None)))
+            assert not all((i <= j) for i, j in zip(sequence, islice(sequence, 1, None)))
 
         Parameters
         ----------
@@ -252,19 +486,14 @@ class MonotonicMixins(abc.ABC):
         TypeError
             If ``sequence`` is not iterable.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        if strict:
-            standardMsg = ('Elements in %s are strictly monotonically '
-                           'increasing') % (sequence,)
-            op = operator.lt
-        else:
-            standardMsg = ('Elements in %s are monotonically '
-                           'increasing') % (sequence,)
-            op = operator.le
+        op = _LT if strict else _LE
 
         if self._monotonic(op, sequence):
+            kind = 'strictly monotonically' if strict else 'monotonically'
+            standardMsg = f'Elements in {sequence} are {kind} increasing'
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertMonotonicDecreasing(self, sequence, strict=True, msg=None):
@@ -278,8 +507,8 @@ class MonotonicMixins(abc.ABC):
 
         .. code-block:: python
 
-            assert all((i > j) for i, j in zip(sequence, sequence[1:]))
-            assert all((i >= j) for i, j in zip(sequence, sequence[1:]))
+            assert all((i > j) for i, j in zip(sequence, islice(sequence, 1, None)))
+            assert all((i >= j) for i, j in zip(sequence, islice(sequence, 1, None)))
 
         Parameters
         ----------
@@ -294,19 +523,14 @@ class MonotonicMixins(abc.ABC):
         TypeError
             If ``sequence`` is not iterable.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        if strict:
-            standardMsg = ('Elements in %s are not strictly monotonically '
-                           'decreasing') % (sequence,)
-            op = operator.gt
-        else:
-            standardMsg = ('Elements in %s are not monotonically '
-                           'decreasing') % (sequence,)
-            op = operator.ge
+        op = _GT if strict else _GE
 
         if not self._monotonic(op, sequence):
+            kind = 'strictly monotonically' if strict else 'monotonically'
+            standardMsg = f'Elements in {sequence} are not {kind} decreasing'
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertNotMonotonicDecreasing(self, sequence, strict=True, msg=None):
@@ -320,8 +544,8 @@ class MonotonicMixins(abc.ABC):
 
         .. code-block:: python
 
-            assert not all((i > j) for i, j in zip(sequence, sequence[1:]))
-            assert not all((i >= j) for i, j in zip(sequence, sequence[1:]))
+            assert not all((i > j) for i, j in zip(sequence, islice(sequence, 1, None)))
+            assert not all((i >= j) for i, j in zip(sequence, islice(sequence, 1, None)))
 
         Parameters
         ----------
@@ -336,19 +560,14 @@ class MonotonicMixins(abc.ABC):
         TypeError
             If ``sequence`` is not iterable.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        if strict:
-            standardMsg = ('Elements in %s are strictly monotonically '
-                           'decreasing') % (sequence,)
-            op = operator.gt
-        else:
-            standardMsg = ('Elements in %s are monotonically '
-                           'decreasing') % (sequence,)
-            op = operator.ge
+        op = _GT if strict else _GE
 
         if self._monotonic(op, sequence):
+            kind = 'strictly monotonically' if strict else 'monotonically'
+            standardMsg = f'Elements in {sequence} are {kind} decreasing'
             self.fail(self._formatMessage(msg, standardMsg))
 
 
@@ -371,6 +590,76 @@ class UniqueMixins(abc.ABC):
     def _formatMessage(self, msg, standardMsg):
         pass  # pragma: no cover
 
+    @staticmethod
+    def _unique(container):
+        arr = _as_array(container, 'biufcmMSU')
+        if arr is not None:
+            if arr.dtype.kind in 'biu' and arr.dtype.itemsize <= 2:
+                # There are at most 65536 distinct values, so it's
+                # cheaper to count them than to sort them
+                import numpy as np
+
+                if not len(arr):
+                    return True
+                counts = np.bincount(arr.astype(np.intp) - arr.min())
+                return counts.max() <= 1
+            if arr.dtype.kind in 'fcmM':
+                # NaN and NaT aren't equal to anything, not even
+                # themselves, so they can never be duplicates
+                arr = arr[arr == arr]
+            # Sort a copy so that any duplicates end up side by side
+            arr = arr.copy()
+            arr.sort()
+            return not (arr[1:] == arr[:-1]).any()
+
+        # Hashing is linear, so try that first, but fall back to
+        # comparing elements pairwise to allow for containers that
+        # contain unhashable types
+        try:
+            return len(container) == len(set(container))
+        except TypeError:
+            return UniqueMixins._slow_unique(container)
+
+    @staticmethod
+    def _slow_unique(container):
+        # Hashable elements can still be looked up in a set, so only
+        # comparisons involving an unhashable element are made one by
+        # one. Those are needed both ways round, because a hashable
+        # element can equal an unhashable one (e.g., frozenset({1})
+        # and {1})
+        hashable = set()
+        unhashable = []
+        try:
+            for elem in container:
+                # Sets can be looked up in sets (as frozensets), so ask
+                # for the hash rather than relying on the lookup failing
+                try:
+                    hash(elem)
+                except TypeError:
+                    if elem in unhashable or any(elem == seen
+                                                 for seen in hashable):
+                        return False
+                    unhashable.append(elem)
+                else:
+                    if elem in hashable or elem in unhashable:
+                        return False
+                    hashable.add(elem)
+        except ValueError:
+            # Elements such as the rows of a 2-D numpy array compare
+            # elementwise, and the result has no truth value, so let
+            # the container do its own membership tests instead
+            return UniqueMixins._pairwise_unique(container)
+        return True
+
+    @staticmethod
+    def _pairwise_unique(container):
+        # If elem appears at an earlier or later index position the
+        # elements are not unique
+        for idx, elem in enumerate(container):
+            if elem in container[:idx] or elem in container[idx+1:]:
+                return False
+        return True
+
     def assertUnique(self, container, msg=None):
         '''Fail if elements in ``container`` are not unique.
 
@@ -386,19 +675,12 @@ class UniqueMixins(abc.ABC):
         TypeError
             If ``container`` is not iterable.
         '''
-        if not isinstance(container, collections.abc.Iterable):
+        if not _is_iterable(container):
             raise TypeError('First argument is not iterable')
 
-        standardMsg = 'Elements in %s are not unique' % (container,)
-
-        # We iterate over each element in the container instead of
-        # comparing len(container) == len(set(container)) to allow
-        # for containers that contain unhashable types
-        for idx, elem in enumerate(container):
-            # If elem appears at an earlier or later index position
-            # the elements are not unique
-            if elem in container[:idx] or elem in container[idx+1:]:
-                self.fail(self._formatMessage(msg, standardMsg))
+        if not self._unique(container):
+            standardMsg = f'Elements in {container} are not unique'
+            self.fail(self._formatMessage(msg, standardMsg))
 
     def assertNotUnique(self, container, msg=None):
         '''Fail if elements in ``container`` are unique.
@@ -415,21 +697,12 @@ class UniqueMixins(abc.ABC):
         TypeError
             If ``container`` is not iterable.
         '''
-        if not isinstance(container, collections.abc.Iterable):
+        if not _is_iterable(container):
             raise TypeError('First argument is not iterable')
 
-        standardMsg = 'Elements in %s are unique' % (container,)
-
-        # We iterate over each element in the container instead of
-        # comparing len(container) == len(set(container)) to allow
-        # for containers that contain unhashable types
-        for idx, elem in enumerate(container):
-            # If elem appears at an earlier or later index position
-            # the elements are not unique
-            if elem in container[:idx] or elem in container[idx+1:]:
-                return  # succeed fast
-
-        self.fail(self._formatMessage(msg, standardMsg))
+        if self._unique(container):
+            standardMsg = f'Elements in {container} are unique'
+            self.fail(self._formatMessage(msg, standardMsg))
 
 
 class FileMixins(abc.ABC):
@@ -555,80 +828,124 @@ class FileMixins(abc.ABC):
         '''
         if isinstance(filename, (str, bytes)):
             f = open(filename)
-        elif hasattr(filename, 'read') and hasattr(filename, 'write'):
+        elif (getattr(filename, 'read', None) is not None and
+              getattr(filename, 'write', None) is not None):
             f = filename
         else:
             raise TypeError('filename must be str or bytes, or a file')
         return f
 
-    def _get_file_name(self, filename):
+    @contextlib.contextmanager
+    def _file_ctx(self, filename):
+        '''Yield the file object for ``filename``. If ``filename`` is
+        a string or bytes object, the file is opened here and closed
+        on exit; file-like objects are left open for the caller.
+        '''
         f = self._get_or_open_file(filename)
 
         try:
-            fname = f.name
-        except AttributeError as e:
-            # If f doesn't have an name attribute,
-            # raise a TypeError
-            if e.args == ('name',):
-                raise TypeError('Expected file-like object')
-            raise e  # pragma: no cover
+            yield f
         finally:
-            f.close()
+            if f is not filename:
+                f.close()
+
+    def _get_file_name(self, filename):
+        # There's no need to open the file to find out its name
+        if isinstance(filename, (str, bytes)):
+            return filename
+
+        with self._file_ctx(filename) as f:
+            try:
+                fname = f.name
+            except AttributeError as e:
+                # If f doesn't have an name attribute,
+                # raise a TypeError
+                if e.args == ('name',):
+                    raise TypeError('Expected file-like object')
+                raise e  # pragma: no cover
 
         return fname
 
     def _get_file_type(self, filename):
-        f = self._get_or_open_file(filename)
-
-        try:
-            fname = f.name
-        except AttributeError as e:
-            # If f doesn't have an name attribute,
-            # raise a TypeError
-            if e.args == ('name',):
-                raise TypeError('Expected file-like object')
-            raise e  # pragma: no cover
-        else:
-            filetype = os.path.splitext(fname)[-1]
-        finally:
-            f.close()
+        fname = self._get_file_name(filename)
 
-        return filetype
+        return os.path.splitext(fname)[-1]
 
     def _get_file_encoding(self, filename):
-        f = self._get_or_open_file(filename)
-
-        try:
-            encoding = f.encoding
-        except AttributeError as e:
-            # If f doesn't have an encoding attribute,
-            # raise a TypeError
-            if e.args == ('encoding',):
-                raise TypeError('Expected file-like object')
-            raise e  # pragma: no cover
-        finally:
-            f.close()
+        with self._file_ctx(filename) as f:
+            try:
+                encoding = f.encoding
+            except AttributeError as e:
+                # If f doesn't have an encoding attribute,
+                # raise a TypeError
+                if e.args == ('encoding',):
+                    raise TypeError('Expected file-like object')
+                raise e  # pragma: no cover
 
         return encoding
 
     def _get_file_size(self, filename):
-        f = self._get_or_open_file(filename)
+        # A single stat call is cheaper than opening the file and
+        # seeking to the end. Only a regular file's st_size is its
+        # length, so anything else (e.g., a directory) goes through
+        # open() and fails the way it always has
+        if isinstance(filename, (str, bytes)):
+            st = os.stat(filename)
+            if stat.S_ISREG(st.st_mode):
+                return st.st_size
+
+        with self._file_ctx(filename) as f:
+            try:
+                f.seek(0, os.SEEK_END)
+            except AttributeError as e:
+                # If f doesn't have a seek method,
+                # raise a TypeError
+                if e.args == ('seek',):
+                    raise TypeError('Expected file-like object')
+                raise e  # pragma: no cover
 
-        try:
-            f.seek(0, os.SEEK_END)
-        except AttributeError as e:
-            # If f doesn't have a seek method,
-            # raise a TypeError
-            if e.args == ('seek',):
-                raise TypeError('Expected file-like object')
-            raise e  # pragma: no cover
-        else:
             length = f.tell()
-        finally:
-            f.close()
 
         return length
 
+    def _get_file_sizes(self, filenames):
+        sizes = {}
+
+        if _SCANDIR_SIZES:
+            # Group local files by directory so that each directory
+            # with enough of them is read once instead of stat-ing
+            # every file
+            by_dir = {}
+            for filename in filenames:
+                if isinstance(filename, (str, bytes)):
+                    dirname = os.path.dirname(filename)
+                    by_dir.setdefault(dirname, []).append(filename)
+
+            for dirname, names in by_dir.items():
+                if len(names) < _SCANDIR_MIN_FILES:
+                    continue
+                wanted = {os.path.basename(name): name for name in names}
+                if not dirname:
+                    dirname = b'.' if isinstance(dirname, bytes) else '.'
+                with os.scandir(dirname) as it:
+                    for entry in it:
+                        if entry.name in wanted and entry.is_file():
+                            sizes[wanted[entry.name]] = entry.stat().st_size
+
+        for filename in filenames:
+            if filename not in sizes:
+                sizes[filename] = self._get_file_size(filename)
+
+        return sizes
+
+    def _describe_file(self, filename):
+        # File-like objects needn't have a name (e.g., io.BytesIO),
+        # and a failure message shouldn't turn into an error
+        try:
+            return self._get_file_name(filename)
+        except (AttributeError, TypeError):
+            return repr(filename)
+
     def assertFileExists(self, filename, msg=None):
         '''Fail if ``filename`` does not exist as determined by
         ``os.path.isfile(filename)``.
@@ -640,9 +957,8 @@ class FileMixins(abc.ABC):
             If not provided, the :mod:`marbles.mixins` or
             :mod:`unittest` standard message will be used.
         '''
-        standardMsg = '%s does not exist' % filename
-
         if not os.path.isfile(filename):
+            standardMsg = '%s does not exist' % filename
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertFileNotExists(self, filename, msg=None):
@@ -656,9 +972,8 @@ class FileMixins(abc.ABC):
             If not provided, the :mod:`marbles.mixins` or
             :mod:`unittest` standard message will be used.
         '''
-        standardMsg = '%s exists' % filename
-
         if os.path.isfile(filename):
+            standardMsg = '%s exists' % filename
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertFileNameEqual(self, filename, name, msg=None):
@@ -803,14 +1118,16 @@ class FileMixins(abc.ABC):
             If ``filename`` is not a str or bytes object and is not
             file-like.
         '''
-        fencoding = self._get_file_encoding(filename)
-
-        fname = self._get_file_name(filename)
-        standardMsg = '%s is not %s encoded' % (fname, encoding)
-
-        self.assertEqual(fencoding.lower(),
-                         encoding.lower(),
-                         self._formatMessage(msg, standardMsg))
+        with self._file_ctx(filename) as f:
+            fencoding = self._get_file_encoding(f)
+
+            # Only lowercase the encodings if they don't already match,
+            # and only get the name if we need it for the message
+            if (fencoding != encoding and
+                    fencoding.lower() != encoding.lower()):
+                fname = self._get_file_name(f)
+                standardMsg = '%s is not %s encoded' % (fname, encoding)
+                self.fail(self._formatMessage(msg, standardMsg))
 
     def assertFileEncodingNotEqual(self, filename, encoding, msg=None):
         '''Fail if ``filename`` is encoded with the given ``encoding``
@@ -830,14 +1147,16 @@ class FileMixins(abc.ABC):
             If ``filename`` is not a str or bytes object and is not
             file-like.
         '''
-        fencoding = self._get_file_encoding(filename)
-
-        fname = self._get_file_name(filename)
-        standardMsg = '%s is %s encoded' % (fname, encoding)
-
-        self.assertNotEqual(fencoding.lower(),
-                            encoding.lower(),
-                            self._formatMessage(msg, standardMsg))
+        with self._file_ctx(filename) as f:
+            fencoding = self._get_file_encoding(f)
+
+            # Only lowercase the encodings if they don't already match,
+            # and only get the name if we need it for the message
+            if (fencoding == encoding or
+                    fencoding.lower() == encoding.lower()):
+                fname = self._get_file_name(f)
+                standardMsg = '%s is %s encoded' % (fname, encoding)
+                self.fail(self._formatMessage(msg, standardMsg))
 
     def assertFileSizeEqual(self, filename, size, msg=None):
         '''Fail if ``filename`` does not have the given ``size`` as
@@ -1019,6 +1338,42 @@ class FileMixins(abc.ABC):
         fsize = self._get_file_size(filename)
         self.assertLessEqual(fsize, size, msg=msg)
 
+    def assertFileSizesEqual(self, sizes, msg=None):
+        '''Fail if any file in ``sizes`` does not have the size it is
+        mapped to as determined by the '==' operator.
+
+        This is equivalent to calling :meth:`assertFileSizeEqual` for
+        each item in ``sizes``, but reports every mismatched file at
+        once. On Windows, files that share a directory are sized with
+        a single directory listing instead of one stat call each.
+
+        Parameters
+        ----------
+        sizes : dict
+            Maps str, bytes, or file-like ``filename`` objects to
+            their expected sizes.
+        msg : str
+            If not provided, the :mod:`marbles.mixins` or
+            :mod:`unittest` standard message will be used.
+
+        Raises
+        ------
+        TypeError
+            If any file in ``sizes`` is not a str or bytes object and
+            is not file-like.
+        '''
+        fsizes = self._get_file_sizes(sizes)
+        mismatched = [(filename, fsizes[filename], size)
+                      for filename, size in sizes.items()
+                      if fsizes[filename] != size]
+
+        if mismatched:
+            standardMsg = 'File sizes differ: %s' % ', '.join(
+                    '%s (%s != %s)' % (self._describe_file(filename),
+                                       fsize, size)
+                    for filename, fsize, size in mismatched)
+            self.fail(self._formatMessage(msg, standardMsg))
+
 
 class CategoricalMixins(abc.ABC):
     '''Built-in assertions for categorical data.
@@ -1106,6 +1461,19 @@ class CategoricalMixins(abc.ABC):
     CONTINENTS = ['Africa', 'Antarctica', 'Asia', 'Australia',
                   'Europe', 'North America', 'South America']
 
+    # Frozen copies of the tables above for constant-time membership
+    # tests. These aren't substituted for the lists automatically,
+    # since test authors may modify the lists in place
+    _WEEKDAYS_SET = frozenset(WEEKDAYS)
+    _WEEKDAYS_ABBR_SET = frozenset(WEEKDAYS_ABBR)
+    _MONTHS_SET = frozenset(MONTHS)
+    _MONTHS_ABBR_SET = frozenset(MONTHS_ABBR)
+    _US_STATES_SET = frozenset(US_STATES)
+    _US_STATES_ABBR_SET = frozenset(US_STATES_ABBR)
+    _US_TERRITORIES_SET = frozenset(US_TERRITORIES)
+    _US_TERRITORIES_ABBR_SET = frozenset(US_TERRITORIES_ABBR)
+    _CONTINENTS_SET = frozenset(CONTINENTS)
+
     @abc.abstractmethod
     def fail(self, msg):
         pass  # pragma: no cover
@@ -1126,6 +1494,21 @@ class CategoricalMixins(abc.ABC):
     def _formatMessage(self, msg, standardMsg):
         pass  # pragma: no cover
 
+    @staticmethod
+    def _same_levels(levels1, levels2):
+        # Comparing sets is linear, but fall back to checking
+        # membership both ways to allow for unhashable levels. Levels
+        # that are already sets (e.g., _WEEKDAYS_SET) aren't copied.
+        try:
+            set1 = (levels1 if isinstance(levels1, (set, frozenset))
+                    else set(levels1))
+            set2 = (levels2 if isinstance(levels2, (set, frozenset))
+                    else set(levels2))
+            return set1 == set2
+        except TypeError:
+            return (all(level in levels2 for level in levels1) and
+                    all(level in levels1 for level in levels2))
+
     def assertCategoricalLevelsEqual(self, levels1, levels2, msg=None):
         '''Fail if ``levels1`` and ``levels2`` do not have the same
         domain.
@@ -1143,17 +1526,13 @@ class CategoricalMixins(abc.ABC):
         TypeError
             If either ``levels1`` or ``levels2`` is not iterable.
         '''
-        if not isinstance(levels1, collections.abc.Iterable):
+        if not _is_iterable(levels1):
             raise TypeError('First argument is not iterable')
-        if not isinstance(levels2, collections.abc.Iterable):
+        if not _is_iterable(levels2):
             raise TypeError('Second argument is not iterable')
 
-        standardMsg = '%s levels != %s levels' % (levels1, levels2)
-
-        if not all(level in levels2 for level in levels1):
-            self.fail(self._formatMessage(msg, standardMsg))
-
-        if not all(level in levels1 for level in levels2):
+        if not self._same_levels(levels1, levels2):
+            standardMsg = '%s levels != %s levels' % (levels1, levels2)
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertCategoricalLevelsNotEqual(self, levels1, levels2, msg=None):
@@ -1172,21 +1551,13 @@ class CategoricalMixins(abc.ABC):
         TypeError
             If either ``levels1`` or ``levels2`` is not iterable.
         '''
-        if not isinstance(levels1, collections.abc.Iterable):
+        if not _is_iterable(levels1):
             raise TypeError('First argument is not iterable')
-        if not isinstance(levels2, collections.abc.Iterable):
+        if not _is_iterable(levels2):
             raise TypeError('Second argument is not iterable')
 
-        standardMsg = '%s levels == %s levels' % (levels1, levels2)
-
-        unshared_levels = False
-        if not all(level in levels2 for level in levels1):
-            unshared_levels = True
-
-        if not all(level in levels1 for level in levels2):
-            unshared_levels = True
-
-        if not unshared_levels:
+        if self._same_levels(levels1, levels2):
+            standardMsg = '%s levels == %s levels' % (levels1, levels2)
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertCategoricalLevelIn(self, level, levels, msg=None):
@@ -1207,7 +1578,7 @@ class CategoricalMixins(abc.ABC):
         TypeError
             If ``levels`` is not iterable.
         '''
-        if not isinstance(levels, collections.abc.Iterable):
+        if not _is_iterable(levels):
             raise TypeError('Second argument is not iterable')
 
         self.assertIn(level, levels, msg=msg)
@@ -1230,7 +1601,7 @@ class CategoricalMixins(abc.ABC):
         TypeError
             If ``levels`` is not iterable.
         '''
-        if not isinstance(levels, collections.abc.Iterable):
+        if not _is_iterable(levels):
             raise TypeError('Second argument is not iterable')
 
         self.assertNotIn(level, levels, msg=msg)
@@ -1289,34 +1660,43 @@ class DateTimeMixins(abc.ABC):
             If ``target`` is not a datetime or date object and is not
             iterable.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        if strict:
-            standardMsg = '%s is not strictly less than %s' % (sequence,
-                                                               target)
-            op = operator.lt
-        else:
-            standardMsg = '%s is not less than %s' % (sequence, target)
-            op = operator.le
+        # We may need the length and more than one pass, so make sure
+        # one-shot iterators are only consumed once
+        if not hasattr(sequence, '__len__'):
+            sequence = list(sequence)
+        if (_is_iterable(target) and
+                not hasattr(target, '__len__')):
+            target = list(target)
+
+        op = _LT if strict else _LE
 
         # Null date(time)s will always compare False, but
         # we want to know about null date(time)s
-        if isinstance(target, collections.abc.Iterable):
+        if _is_iterable(target):
             if len(target) != len(sequence):
                 raise ValueError(('Length mismatch: '
                                   'first argument contains %s elements, '
                                   'second argument contains %s elements' % (
                                       len(sequence), len(target))))
-            if not all(op(i, j) for i, j in zip(sequence, target)):
-                self.fail(self._formatMessage(msg, standardMsg))
+            ok = _compare_datetime64(op, sequence, target)
+            if ok is None:
+                ok = all(map(op, sequence, target))
         elif isinstance(target, (date, datetime)):
-            if not all(op(element, target) for element in sequence):
-                self.fail(self._formatMessage(msg, standardMsg))
+            ok = _compare_datetime64(op, sequence, target)
+            if ok is None:
+                ok = all(map(op, sequence, repeat(target)))
         else:
             raise TypeError(
                 'Second argument is not a datetime or date object or iterable')
 
+        if not ok:
+            kind = 'strictly less than' if strict else 'less than'
+            standardMsg = '%s is not %s %s' % (sequence, kind, target)
+            self.fail(self._formatMessage(msg, standardMsg))
+
     def assertDateTimesAfter(self, sequence, target, strict=True, msg=None):
         '''Fail if any elements in ``sequence`` are not after
         ``target``.
@@ -1349,35 +1729,43 @@ class DateTimeMixins(abc.ABC):
             If ``target`` is not a datetime or date object and is not
             iterable.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        if strict:
-            standardMsg = '%s is not strictly greater than %s' % (sequence,
-                                                                  target)
-            op = operator.gt
-        else:
-            standardMsg = '%s is not greater than %s' % (sequence,
-                                                         target)
-            op = operator.ge
+        # We may need the length and more than one pass, so make sure
+        # one-shot iterators are only consumed once
+        if not hasattr(sequence, '__len__'):
+            sequence = list(sequence)
+        if (_is_iterable(target) and
+                not hasattr(target, '__len__')):
+            target = list(target)
+
+        op = _GT if strict else _GE
 
         # Null date(time)s will always compare False, but
         # we want to know about null date(time)s
-        if isinstance(target, collections.abc.Iterable):
+        if _is_iterable(target):
             if len(target) != len(sequence):
                 raise ValueError(('Length mismatch: '
                                   'first argument contains %s elements, '
                                   'second argument contains %s elements' % (
                                       len(sequence), len(target))))
-            if not all(op(i, j) for i, j in zip(sequence, target)):
-                self.fail(self._formatMessage(msg, standardMsg))
+            ok = _compare_datetime64(op, sequence, target)
+            if ok is None:
+                ok = all(map(op, sequence, target))
         elif isinstance(target, (date, datetime)):
-            if not all(op(element, target) for element in sequence):
-                self.fail(self._formatMessage(msg, standardMsg))
+            ok = _compare_datetime64(op, sequence, target)
+            if ok is None:
+                ok = all(map(op, sequence, repeat(target)))
         else:
             raise TypeError(
                 'Second argument is not a datetime or date object or iterable')
 
+        if not ok:
+            kind = 'strictly greater than' if strict else 'greater than'
+            standardMsg = '%s is not %s %s' % (sequence, kind, target)
+            self.fail(self._formatMessage(msg, standardMsg))
+
     def assertDateTimesPast(self, sequence, strict=True, msg=None):
         '''Fail if any elements in ``sequence`` are not in the past.
 
@@ -1407,17 +1795,16 @@ class DateTimeMixins(abc.ABC):
             If max element in ``sequence`` is not a datetime or date
             object.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        # Cannot compare datetime to date, so if dates are provided use
-        # date.today(), if datetimes are provided use datetime.today()
-        if isinstance(max(sequence), datetime):
-            target = datetime.today()
-        elif isinstance(max(sequence), date):
-            target = date.today()
-        else:
-            raise TypeError('Expected iterable of datetime or date objects')
+        # We pass sequence on after finding its extremum, so make sure
+        # one-shot iterators are only consumed once
+        if not hasattr(sequence, '__len__'):
+            sequence = list(sequence)
+
+        extremum = max(sequence)
+        target = _now_like(extremum)
 
         self.assertDateTimesBefore(sequence, target, strict=strict, msg=msg)
 
@@ -1450,20 +1837,46 @@ class DateTimeMixins(abc.ABC):
             If min element in ``sequence`` is not a datetime or date
             object.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
 
-        # Cannot compare datetime to date, so if dates are provided use
-        # date.today(), if datetimes are provided use datetime.today()
-        if isinstance(min(sequence), datetime):
-            target = datetime.today()
-        elif isinstance(min(sequence), date):
-            target = date.today()
-        else:
-            raise TypeError('Expected iterable of datetime or date objects')
+        # We pass sequence on after finding its extremum, so make sure
+        # one-shot iterators are only consumed once
+        if not hasattr(sequence, '__len__'):
+            sequence = list(sequence)
+
+        extremum = min(sequence)
+        target = _now_like(extremum)
 
         self.assertDateTimesAfter(sequence, target, strict=strict, msg=msg)
 
+    @staticmethod
+    def _frequency_mismatch(sequence, frequency):
+        '''Return the position of the first element in ``sequence``
+        that doesn't follow its predecessor by ``frequency``, or
+        ``None`` if they all do.
+        '''
+        arr = _as_array(sequence, 'M')
+        if arr is not None:
+            import numpy as np
+
+            # NaT differences never compare equal, so nulls still fail
+            bad = np.flatnonzero(np.diff(arr) != np.timedelta64(frequency))
+            return int(bad[0]) + 1 if len(bad) else None
+
+        it = iter(sequence)
+        prev = next(it, None)
+        for i, elem in enumerate(it, 1):
+            # Nulls such as None or NaN can't be subtracted from a
+            # date(time), but they should fail rather than error
+            try:
+                if elem - prev != frequency:
+                    return i
+            except TypeError:
+                return i
+            prev = elem
+        return None
+
     def assertDateTimesFrequencyEqual(self, sequence, frequency, msg=None):
         '''Fail if any elements in ``sequence`` aren't separated by
         the expected ``fequency``.
@@ -1486,19 +1899,15 @@ class DateTimeMixins(abc.ABC):
         # TODO (jsa): check that elements in sequence are dates or
         # datetimes, keeping in mind that sequence may contain null
         # values
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
         if not isinstance(frequency, timedelta):
             raise TypeError('Second argument is not a timedelta object')
 
-        standardMsg = 'unexpected frequencies found in %s' % sequence
-
-        s1 = pd.Series(sequence)
-        s2 = s1.shift(-1)
-
-        freq = s2 - s1
-
-        if not all(f == frequency for f in freq[:-1]):
+        pos = self._frequency_mismatch(sequence, frequency)
+        if pos is not None:
+            standardMsg = 'unexpected frequency at position %d in %s' % (
+                    pos, sequence)
             self.fail(self._formatMessage(msg, standardMsg))
 
     def assertDateTimesLagEqual(self, sequence, lag, msg=None):
@@ -1530,21 +1939,15 @@ class DateTimeMixins(abc.ABC):
             If max element in ``sequence`` is not a datetime or date
             object.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
         if not isinstance(lag, timedelta):
             raise TypeError('Second argument is not a timedelta object')
 
-        # Cannot compare datetime to date, so if dates are provided use
-        # date.today(), if datetimes are provided use datetime.today()
-        if isinstance(max(sequence), datetime):
-            target = datetime.today()
-        elif isinstance(max(sequence), date):
-            target = date.today()
-        else:
-            raise TypeError('Expected iterable of datetime or date objects')
+        extremum = max(sequence)
+        target = _now_like(extremum)
 
-        self.assertEqual(target - max(sequence), lag, msg=msg)
+        self.assertEqual(target - extremum, lag, msg=msg)
 
     def assertDateTimesLagLess(self, sequence, lag, msg=None):
         '''Fail if max element in ``sequence`` is separated from
@@ -1576,21 +1979,15 @@ class DateTimeMixins(abc.ABC):
             If max element in ``sequence`` is not a datetime or date
             object.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
         if not isinstance(lag, timedelta):
             raise TypeError('Second argument is not a timedelta object')
 
-        # Cannot compare datetime to date, so if dates are provided use
-        # date.today(), if datetimes are provided use datetime.today()
-        if isinstance(max(sequence), datetime):
-            target = datetime.today()
-        elif isinstance(max(sequence), date):
-            target = date.today()
-        else:
-            raise TypeError('Expected iterable of datetime or date objects')
+        extremum = max(sequence)
+        target = _now_like(extremum)
 
-        self.assertLess(target - max(sequence), lag, msg=msg)
+        self.assertLess(target - extremum, lag, msg=msg)
 
     def assertDateTimesLagLessEqual(self, sequence, lag, msg=None):
         '''Fail if max element in ``sequence`` is separated from
@@ -1622,21 +2019,15 @@ class DateTimeMixins(abc.ABC):
             If max element in ``sequence`` is not a datetime or date
             object.
         '''
-        if not isinstance(sequence, collections.abc.Iterable):
+        if not _is_iterable(sequence):
             raise TypeError('First argument is not iterable')
         if not isinstance(lag, timedelta):
             raise TypeError('Second argument is not a timedelta object')
 
-        # Cannot compare datetime to date, so if dates are provided use
-        # date.today(), if datetimes are provided use datetime.today()
-        if isinstance(max(sequence), datetime):
-            target = datetime.today()
-        elif isinstance(max(sequence), date):
-            target = date.today()
-        else:
-            raise TypeError('Expected iterable of datetime or date objects')
+        extremum = max(sequence)
+        target = _now_like(extremum)
 
-        self.assertLessEqual(target - max(sequence), lag, msg=msg)
+        self.assertLessEqual(target - extremum, lag, msg=msg)
 
     def assertTimeZoneIsNone(self, dt, msg=None):
         '''Fail if ``dt`` has a non-null ``tzinfo`` attribute.
@@ -20,24 +20,35 @@
 #  IN THE SOFTWARE.
 #
 
+import io
 import operator
 import os
+import stat
+import subprocess
+import sys
+import tempfile
 import unittest
 from unittest import mock
 from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
 
 from marbles.mixins import mixins
 
 
 class TestBetweenMixins(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         class TestBetween(unittest.TestCase, mixins.BetweenMixins): pass  # noqa: E701
 
-        setattr(self, 'kls', TestBetween())
+        setattr(cls, 'kls', TestBetween())
 
-    def tearDown(self):
-        delattr(self, 'kls')
+    @classmethod
+    def tearDownClass(cls):
+        delattr(cls, 'kls')
 
     def test_assert_between(self):
         self.kls.assertBetween(10, 0, 20, strict=True)
@@ -84,20 +95,116 @@ class TestBetweenMixins(unittest.TestCase):
             self.kls.assertNotBetween(10, 10, 10, strict=True)
         self.assertEqual(e.exception.args[0], msg)
 
+    def test_assert_between_array(self):
+        for kind in (np.array, pd.Series):
+            with self.subTest(kind=kind):
+                obj = kind([1, 5, 10, 15])
+                self.kls.assertBetween(obj, 0, 20, strict=True)
+                self.kls.assertBetween(obj, 1, 15, strict=False)
+
+                msg = ('Elements of %s at positions 0, 3 are not strictly '
+                       'between %s and %s') % (obj, 1, 15)
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertBetween(obj, 1, 15, strict=True)
+                self.assertEqual(e.exception.args[0], msg)
+
+                msg = ('Elements of %s at positions 0 are not between '
+                       '%s and %s') % (obj, 2, 15)
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertBetween(obj, 2, 15, strict=False)
+                self.assertEqual(e.exception.args[0], msg)
+
+        obj = np.arange(10)
+        msg = ('Elements of %s at positions 4, 5, 6, 7, 8, ... are not '
+               'strictly between %s and %s') % (obj, -1, 4)
+        with self.assertRaises(AssertionError) as e:
+            self.kls.assertBetween(obj, -1, 4)
+        self.assertEqual(e.exception.args[0], msg)
+
+        # NaN is never between anything
+        with self.assertRaises(AssertionError):
+            self.kls.assertBetween(np.array([1.0, float('nan')]), 0, 20)
+
+    def test_assert_between_datetime64_array(self):
+        '''Are stdlib datetime and timedelta bounds compared elementwise?'''
+        for kind in (np.array, pd.Series):
+            with self.subTest(kind=kind):
+                obj = kind(np.array(['2020-01-02', '2020-01-03'],
+                                    dtype='datetime64[ns]'))
+                self.kls.assertBetween(
+                        obj, datetime(2020, 1, 1), datetime(2020, 1, 4))
+                self.kls.assertBetween(
+                        obj, pd.Timestamp(2020, 1, 2), datetime(2020, 1, 3),
+                        strict=False)
+                with self.assertRaises(AssertionError):
+                    self.kls.assertBetween(
+                            obj, datetime(2020, 1, 2), datetime(2020, 1, 4))
+
+                obj = kind(np.array([1, 2], dtype='timedelta64[D]'))
+                self.kls.assertBetween(obj, timedelta(0), timedelta(3))
+                with self.assertRaises(AssertionError):
+                    self.kls.assertBetween(obj, timedelta(1), timedelta(3))
+
+    def test_assert_not_between_array(self):
+        for kind in (np.array, pd.Series):
+            with self.subTest(kind=kind):
+                obj = kind([1, 5, 10, 15])
+                self.kls.assertNotBetween(obj, 16, 20, strict=True)
+                self.kls.assertNotBetween(obj, 15, 20, strict=False)
+
+                msg = ('Elements of %s at positions 1, 2 are between '
+                       '%s and %s') % (obj, 5, 10)
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertNotBetween(obj, 5, 10, strict=True)
+                self.assertEqual(e.exception.args[0], msg)
+
+                msg = ('Elements of %s at positions 3 are strictly between '
+                       '%s and %s') % (obj, 10, 20)
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertNotBetween(obj, 10, 20, strict=False)
+                self.assertEqual(e.exception.args[0], msg)
+
+                obj = kind(np.array(['2020-01-02', '2020-01-03'],
+                                    dtype='datetime64[ns]'))
+                self.kls.assertNotBetween(
+                        obj, datetime(2020, 1, 4), datetime(2020, 1, 5))
+                with self.assertRaises(AssertionError):
+                    self.kls.assertNotBetween(
+                            obj, datetime(2020, 1, 1), datetime(2020, 1, 2))
+
+    def test_between_timezone_aware_bounds(self):
+        '''Are timezone-aware bounds rejected for datetime64 arrays?'''
+        obj = np.array(['2020-01-02'], dtype='datetime64[ns]')
+        aware = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        for method in (self.kls.assertBetween, self.kls.assertNotBetween):
+            with self.subTest(method=method):
+                with self.assertRaises(TypeError) as e:
+                    method(obj, aware, datetime(2020, 1, 4))
+                self.assertEqual(
+                        e.exception.args[0],
+                        'cannot compare timezone-aware bound %s with naive '
+                        'datetime64 elements' % aware)
+
 
 class TestMonotonicMixins(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         class TestMonotonic(unittest.TestCase, mixins.MonotonicMixins): pass  # noqa: E701
 
-        setattr(self, 'kls', TestMonotonic())
+        setattr(cls, 'kls', TestMonotonic())
+
+    @classmethod
+    def tearDownClass(cls):
+        delattr(cls, 'kls')
+
+    def setUp(self):
         setattr(self, 'seq', [1, 2, 3, 3, 4])
         setattr(self, 'seqstrict', (1, 2, 3, 4, 5))
         setattr(self, 'seqrev', 'zzy')
         setattr(self, 'seqrevstrict', 'zyx')
 
     def tearDown(self):
-        delattr(self, 'kls')
         delattr(self, 'seq')
         delattr(self, 'seqstrict')
         delattr(self, 'seqrev')
@@ -149,6 +256,30 @@ class TestMonotonicMixins(unittest.TestCase):
         # If there are no elements in the sequence it's monotonic
         self.assertTrue(self.kls._monotonic(operator.le, []))
 
+    def test_monotonic_array(self):
+        '''Do arrays, Series, and Indexes agree with the generic path?'''
+        seqs = [[1, 2, 3, 3, 4], [1, 2, 3, 4, 5], [5, 4, 4, 2], [5, 3, 1],
+                [1.0, float('nan'), 2.0], [0], []]
+        ops = [operator.lt, operator.le, operator.gt, operator.ge]
+        for seq in seqs:
+            for kind in (np.array, pd.Series, pd.Index):
+                for op in ops:
+                    with self.subTest(seq=seq, kind=kind, op=op):
+                        self.assertEqual(
+                            self.kls._monotonic(op, kind(seq, dtype=float)),
+                            self.kls._monotonic(op, seq))
+
+        # Arrays are compared a chunk at a time, so make sure pairs that
+        # straddle a chunk boundary are compared too
+        arr = np.arange(2 * mixins._ARRAY_CHUNK_SIZE + 1)
+        self.assertTrue(self.kls._monotonic(operator.lt, arr))
+        for idx in (mixins._ARRAY_CHUNK_SIZE, len(arr) - 1):
+            with self.subTest(idx=idx):
+                arr = np.arange(2 * mixins._ARRAY_CHUNK_SIZE + 1)
+                arr[idx] = arr[idx - 1]
+                self.assertFalse(self.kls._monotonic(operator.lt, arr))
+                self.assertTrue(self.kls._monotonic(operator.le, arr))
+
     def test_assert_monotonic_increasing(self):
         self.kls.assertMonotonicIncreasing(self.seqstrict, strict=True)
         self.kls.assertMonotonicIncreasing(self.seq, strict=False)
@@ -213,15 +344,21 @@ class TestMonotonicMixins(unittest.TestCase):
 
 class TestUniqueMixins(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         class TestUnique(unittest.TestCase, mixins.UniqueMixins): pass  # noqa: E701
 
-        setattr(self, 'kls', TestUnique())
+        setattr(cls, 'kls', TestUnique())
+
+    @classmethod
+    def tearDownClass(cls):
+        delattr(cls, 'kls')
+
+    def setUp(self):
         setattr(self, 'seq', [1, 2, 3, 3, 4])
         setattr(self, 'sequnique', (1, 2, 3, 4, 5))
 
     def tearDown(self):
-        delattr(self, 'kls')
         delattr(self, 'seq')
         delattr(self, 'sequnique')
 
@@ -268,72 +405,116 @@ class TestUniqueMixins(unittest.TestCase):
             self.kls.assertNotUnique([set([1, 2, 3]), set([2, 3, 4])])
         self.assertEqual(e.exception.args[0], msg)
 
+        # mixed hashable and unhashable types
+        self.kls.assertUnique([1, 2, [1], 'x', [2], (1,)])
+        self.kls.assertNotUnique([1, [2], 2, 1])
+        self.kls.assertNotUnique([[1], 2, [1]])
+        self.kls.assertNotUnique([frozenset([1]), set([1])])
+        self.kls.assertNotUnique([set([1]), frozenset([1])])
+        self.kls.assertNotUnique(x for x in [set([1]), 2, set([1])])
+
+    def test_unique_array(self):
+        '''Do arrays, Series, and Indexes agree with the generic path?'''
+        seqs = [[1, 2, 3, 3, 4], [1, 2, 3, 4, 5],
+                [1.0, float('nan'), float('nan')],
+                [1.0, float('nan'), 1.0], [0], []]
+        for seq in seqs:
+            for kind in (np.array, pd.Series, pd.Index):
+                with self.subTest(seq=seq, kind=kind):
+                    self.assertEqual(
+                        self.kls._unique(kind(seq, dtype=float)),
+                        self.kls._unique(seq))
+
+        for dtype in ('bool', 'int8', 'uint8', 'int16', 'uint16', 'int64'):
+            with self.subTest(dtype=dtype):
+                self.assertTrue(self.kls._unique(np.array([1, 0], dtype=dtype)))
+                self.assertFalse(self.kls._unique(np.array([1, 0, 1], dtype=dtype)))
+                self.assertTrue(self.kls._unique(np.array([], dtype=dtype)))
+        self.assertTrue(self.kls._unique(np.array([-128, 127], dtype='int8')))
+        self.assertFalse(self.kls._unique(np.array([-5, 3, -5], dtype='int16')))
+
+        self.assertTrue(self.kls._unique(np.array(['a', 'b'])))
+        self.assertFalse(self.kls._unique(np.array(['a', 'a'])))
+        self.assertTrue(self.kls._unique(np.array(['2018-01-01', 'NaT', 'NaT'],
+                                                  dtype='datetime64[D]')))
+
+        # The rows of a 2-D array are compared by the array itself
+        self.kls.assertUnique(np.array([[1, 2], [3, 4]]))
+        self.kls.assertNotUnique(np.array([[1, 2], [1, 2]]))
+        with self.assertRaises(AssertionError):
+            self.kls.assertUnique(np.array([[1, 2], [1, 2]]))
+
 
 class TestFileMixins(unittest.TestCase):
 
-    def setUp(self):
+    filename = 'fake-file-19910914.csv'
+    filesize = 10
+    filetype = '.csv'
+    encoding = 'utf-8'
+    regex = '^[a-z]*-[a-z]*-[0-9]{8}.csv$'
+
+    _ASSERT_MAP = (
+        ('assertFileSizeEqual', 'assertEqual'),
+        ('assertFileSizeNotEqual', 'assertNotEqual'),
+        ('assertFileSizeGreater', 'assertGreater'),
+        ('assertFileSizeGreaterEqual', 'assertGreaterEqual'),
+        ('assertFileSizeLess', 'assertLess'),
+        ('assertFileSizeLessEqual', 'assertLessEqual'),
+    )
+
+    @classmethod
+    def setUpClass(cls):
         class TestFile(unittest.TestCase, mixins.FileMixins): pass  # noqa: E701
 
-        setattr(self, 'kls', TestFile())
-        setattr(self, 'filename', 'fake-file-19910914.csv')
-        setattr(self, 'filesize', 10)
-        setattr(self, 'filetype', '.csv')
-        setattr(self, 'encoding', 'utf-8')
-        setattr(self, 'regex', '^[a-z]*-[a-z]*-[0-9]{8}.csv$')
+        setattr(cls, 'kls', TestFile())
 
-    def tearDown(self):
-        delattr(self, 'kls')
-        delattr(self, 'filename')
-        delattr(self, 'filesize')
-        delattr(self, 'filetype')
-        delattr(self, 'encoding')
-        delattr(self, 'regex')
-
-    def test_get_or_open_file(self):
+    @classmethod
+    def tearDownClass(cls):
+        delattr(cls, 'kls')
+
+    @mock.patch('marbles.mixins.mixins.open')
+    def test_get_or_open_file(self, mock_open):
         filemock = mock.MagicMock()
         filemock.name = self.filename
+        mock_open.return_value = filemock
 
         # filename provided
-        with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-            m.return_value = filemock
-            self.kls._get_or_open_file(self.filename)
-            m.assert_called_once_with(self.filename)
+        self.kls._get_or_open_file(self.filename)
+        mock_open.assert_called_once_with(self.filename)
 
         # file-like object provided
-        with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-            m.return_value = filemock
-            self.kls._get_or_open_file(filemock)
-            m.assert_not_called()
+        mock_open.reset_mock()
+        self.kls._get_or_open_file(filemock)
+        mock_open.assert_not_called()
 
         # file-like object provided but has no read or write attributes
-        with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-            del filemock.read  # pretend there's no read attribute
-            del filemock.write  # pretend there's no write attribute'
-            m.return_value = filemock
+        filemock = mock.MagicMock(spec=['name'])
 
-            with self.assertRaises(TypeError) as e:
-                self.kls._get_or_open_file(filemock)
-            m.assert_not_called()
-            self.assertEqual(e.exception.args[0],
-                             'filename must be str or bytes, or a file')
+        with self.assertRaises(TypeError) as e:
+            self.kls._get_or_open_file(filemock)
+        mock_open.assert_not_called()
+        self.assertEqual(e.exception.args[0],
+                         'filename must be str or bytes, or a file')
 
         with self.assertRaises(TypeError) as e:
             self.kls._get_or_open_file(1)
         self.assertEqual(e.exception.args[0],
                          'filename must be str or bytes, or a file')
 
-    def test_get_file_info(self):
+    @mock.patch('marbles.mixins.mixins.open')
+    def test_get_file_info(self, mock_open):
         # The name of the method being tested, expected attributes,
-        # and the expected return value
+        # the expected return value, and whether the method needs to
+        # open the file when given a file name
         # _get_file_size is tested separately (below) because it
         # relies on methods instead of attributes
         method_info = [
-            (self.kls._get_file_name, ['name'], self.filename),
-            (self.kls._get_file_type, ['name'], self.filetype),
-            (self.kls._get_file_encoding, ['encoding'], self.encoding)
+            (self.kls._get_file_name, ['name'], self.filename, False),
+            (self.kls._get_file_type, ['name'], self.filetype, False),
+            (self.kls._get_file_encoding, ['encoding'], self.encoding, True)
         ]
 
-        for method, attrs, exp in method_info:
+        for method, attrs, exp, opens in method_info:
             with self.subTest(method=method, attrs=attrs, exp=exp):
                 filemock = mock.MagicMock()
 
@@ -342,23 +523,28 @@ class TestFileMixins(unittest.TestCase):
                 filemock.encoding = self.encoding
 
                 # filename provided
-                with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-                    m.return_value = filemock
-                    out = method(exp)
-                    self.assertEqual(out, exp)
-                    m.assert_called_once_with(exp)
+                mock_open.reset_mock()
+                mock_open.return_value = filemock
+                out = method(self.filename)
+                self.assertEqual(out, exp)
+                if opens:
+                    mock_open.assert_called_once_with(self.filename)
+                    # We opened the file, so we should close it
+                    filemock.close.assert_called_once_with()
+                else:
+                    mock_open.assert_not_called()
 
                 # filename provided but is missing attributes
-                with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
+                if opens:
+                    mock_open.reset_mock()
                     for attr in attrs:
                         delattr(filemock, attr)
-                    m.return_value = filemock
 
                     with self.assertRaises(TypeError) as e:
-                        method(exp)
+                        method(self.filename)
                     self.assertEqual(e.exception.args[0],
                                      'Expected file-like object')
-                    m.assert_called_once_with(exp)
+                    mock_open.assert_called_once_with(self.filename)
 
                 # file-like object provided
                 filemock = mock.MagicMock()
@@ -367,66 +553,54 @@ class TestFileMixins(unittest.TestCase):
                 filemock.name = self.filename
                 filemock.encoding = self.encoding
 
-                with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-                    m.return_value = filemock
-                    out = method(filemock)
-                    self.assertEqual(out, exp)
-                    m.assert_not_called()
+                mock_open.reset_mock()
+                mock_open.return_value = filemock
+                out = method(filemock)
+                self.assertEqual(out, exp)
+                mock_open.assert_not_called()
+                # The caller opened the file, so they should close it
+                filemock.close.assert_not_called()
 
                 # missing attributes
-                with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-                    for attr in attrs:
-                        delattr(filemock, attr)
-                    m.return_value = filemock
+                for attr in attrs:
+                    delattr(filemock, attr)
 
-                    with self.assertRaises(TypeError) as e:
-                        method(filemock)
-                    self.assertEqual(e.exception.args[0],
-                                     'Expected file-like object')
-                    m.assert_not_called()
+                with self.assertRaises(TypeError) as e:
+                    method(filemock)
+                self.assertEqual(e.exception.args[0],
+                                 'Expected file-like object')
+                mock_open.assert_not_called()
 
         # _get_file_size is a little bit special in that it expects
         # methods instead of attributes, and methods are mocked
         # differently than attributes
         filemock = mock.MagicMock()
         filemock.tell.return_value = self.filesize
+        mock_open.reset_mock()
+        mock_open.return_value = filemock
 
         # filename provided
-        with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-            m.return_value = filemock
+        with mock.patch.object(os, 'stat') as ms:
+            ms.return_value.st_mode = stat.S_IFREG
+            ms.return_value.st_size = self.filesize
             out = self.kls._get_file_size(self.filename)
             self.assertEqual(out, self.filesize)
-            m.assert_called_once_with(self.filename)
-
-        # filename provided but is missing attributes
-        with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-            del filemock.seek
-            m.return_value = filemock
-
-            with self.assertRaises(TypeError) as e:
-                self.kls._get_file_size(self.filename)
-            self.assertEqual(e.exception.args[0], 'Expected file-like object')
-            m.assert_called_once_with(self.filename)
+            ms.assert_called_once_with(self.filename)
+            mock_open.assert_not_called()
 
         # file-like object provided
-        filemock = mock.MagicMock()
-        filemock.tell.return_value = self.filesize
-
-        with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-            m.return_value = filemock
-            out = self.kls._get_file_size(filemock)
-            self.assertEqual(out, self.filesize)
-            m.assert_not_called()
+        out = self.kls._get_file_size(filemock)
+        self.assertEqual(out, self.filesize)
+        mock_open.assert_not_called()
+        filemock.close.assert_not_called()
 
         # missing attributes
-        with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as m:
-            del filemock.seek
-            m.return_value = filemock
+        del filemock.seek
 
-            with self.assertRaises(TypeError) as e:
-                self.kls._get_file_size(filemock)
-            self.assertEqual(e.exception.args[0], 'Expected file-like object')
-            m.assert_not_called()
+        with self.assertRaises(TypeError) as e:
+            self.kls._get_file_size(filemock)
+        self.assertEqual(e.exception.args[0], 'Expected file-like object')
+        mock_open.assert_not_called()
 
     @mock.patch.object(os.path, 'isfile')
     def test_assert_file_exists(self, mock_exists):
@@ -449,8 +623,9 @@ class TestFileMixins(unittest.TestCase):
     def test_assert_file_name_equal(self, mock_get):
         mock_get.return_value = self.filename
 
-        filemock = mock.MagicMock()
-        filemock.name = self.filename
+        # _get_file_name is mocked out, so this only needs to be
+        # something other than a file name
+        filemock = SimpleNamespace(name=self.filename)
 
         with mock.patch.object(unittest.TestCase, 'assertEqual') as m:
             # filename provided
@@ -490,8 +665,9 @@ class TestFileMixins(unittest.TestCase):
     def test_assert_file_name_regex(self, mock_get):
         mock_get.return_value = self.filename
 
-        filemock = mock.MagicMock()
-        filemock.name = self.filename
+        # _get_file_name is mocked out, so this only needs to be
+        # something other than a file name
+        filemock = SimpleNamespace(name=self.filename)
 
         with mock.patch.object(unittest.TestCase, 'assertRegex') as m:
             # filename provided
@@ -529,8 +705,9 @@ class TestFileMixins(unittest.TestCase):
     def test_assert_file_type_equal(self, mock_get):
         mock_get.return_value = self.filetype
 
-        filemock = mock.MagicMock()
-        filemock.name = self.filename
+        # _get_file_name is mocked out, so this only needs to be
+        # something other than a file name
+        filemock = SimpleNamespace(name=self.filename)
 
         with mock.patch.object(unittest.TestCase, 'assertEqual') as m:
             # filename provided
@@ -563,99 +740,82 @@ class TestFileMixins(unittest.TestCase):
             self.kls.assertFileTypeNotEqual(filemock, '.csv', msg='override')
             m.assert_called_with('.csv', '.csv', msg='override')
 
-    @mock.patch.object(mixins.FileMixins, '_get_file_encoding')
-    def test_assert_file_encoding_equal(self, mock_get):
-        mock_get.return_value = self.encoding
-
+    @mock.patch('marbles.mixins.mixins.open')
+    def test_assert_file_encoding_equal(self, mo):
         filemock = mock.MagicMock()
         filemock.name = self.filename
         filemock.encoding = self.encoding
+        mo.return_value = filemock
 
-        with mock.patch.object(unittest.TestCase, 'assertEqual') as m:
-            # filename provided
-            with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as mo:
-                mo.return_value = filemock
-
-                msg = '%s is not %s encoded' % (self.filename, self.encoding)
-                self.kls.assertFileEncodingEqual(self.filename, self.encoding)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with('utf-8', self.encoding, msg)
+        for filename in (self.filename, filemock):
+            with self.subTest(filename=filename):
+                mo.reset_mock()
 
-                over_msg = self._formatMessage('override', msg)
-                self.kls.assertFileEncodingEqual(self.filename,
-                                                 self.encoding,
-                                                 msg='override')
-                mo.assert_called_with(self.filename)
-                m.assert_called_with('utf-8', self.encoding, over_msg)
+                # The file should only be opened once, if at all
+                self.kls.assertFileEncodingEqual(filename, self.encoding)
+                if filename is self.filename:
+                    mo.assert_called_once_with(self.filename)
+                else:
+                    mo.assert_not_called()
 
-            # file-like object provided
-            self.kls.assertFileEncodingEqual(filemock, self.encoding)
-            m.assert_called_with('utf-8', self.encoding, msg)
+                # Encodings are compared case-insensitively
+                self.kls.assertFileEncodingEqual(filename, 'UTF-8')
 
-            self.kls.assertFileEncodingEqual(filemock,
-                                             self.encoding,
-                                             msg='override')
-            m.assert_called_with('utf-8', self.encoding, over_msg)
+                msg = '%s is not %s encoded' % (self.filename, 'ascii')
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertFileEncodingEqual(filename, 'ascii')
+                self.assertEqual(e.exception.args[0], msg)
 
-        with mock.patch.object(unittest.TestCase, 'assertNotEqual') as m:
-            # filename provided
-            with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as mo:
-                mo.return_value = filemock
+                over_msg = self._formatMessage('override', msg)
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertFileEncodingEqual(filename,
+                                                     'ascii',
+                                                     msg='override')
+                self.assertEqual(e.exception.args[0], over_msg)
+
+                mo.reset_mock()
+                self.kls.assertFileEncodingNotEqual(filename, 'ascii')
+                if filename is self.filename:
+                    mo.assert_called_once_with(self.filename)
+                else:
+                    mo.assert_not_called()
 
                 msg = '%s is %s encoded' % (self.filename, self.encoding)
-                self.kls.assertFileEncodingNotEqual(self.filename,
-                                                    self.encoding)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with('utf-8', self.encoding, msg)
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertFileEncodingNotEqual(filename,
+                                                        self.encoding)
+                self.assertEqual(e.exception.args[0], msg)
 
                 over_msg = self._formatMessage('override', msg)
-                self.kls.assertFileEncodingNotEqual(self.filename,
-                                                    self.encoding,
-                                                    msg='override')
-                mo.assert_called_with(self.filename)
-                m.assert_called_with('utf-8', self.encoding, over_msg)
-
-            # file-like object provided
-            self.kls.assertFileEncodingNotEqual(filemock, self.encoding)
-            m.assert_called_with('utf-8', self.encoding, msg)
-
-            self.kls.assertFileEncodingNotEqual(filemock,
-                                                self.encoding,
-                                                msg='override')
-            m.assert_called_with('utf-8', self.encoding, over_msg)
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertFileEncodingNotEqual(filename,
+                                                        self.encoding,
+                                                        msg='override')
+                self.assertEqual(e.exception.args[0], over_msg)
 
+    @mock.patch.object(os, 'stat')
     @mock.patch.object(mixins.FileMixins, '_get_file_encoding')
-    def test_assert_file_size_equalities(self, mock_get):
+    def test_assert_file_size_equalities(self, mock_get, mock_stat):
         '''assertFileSize* equality assertions => unittest equality assertions'''
         mock_get.return_value = self.filesize
+        mock_stat.return_value.st_mode = stat.S_IFREG
+        mock_stat.return_value.st_size = self.filesize
 
         filemock = mock.MagicMock()
         filemock.tell.return_value = self.filesize
 
-        assert_map = {
-            self.kls.assertFileSizeEqual: 'assertEqual',
-            self.kls.assertFileSizeNotEqual: 'assertNotEqual',
-            self.kls.assertFileSizeGreater: 'assertGreater',
-            self.kls.assertFileSizeGreaterEqual: 'assertGreaterEqual',
-            self.kls.assertFileSizeLess: 'assertLess',
-            self.kls.assertFileSizeLessEqual: 'assertLessEqual'
-        }
-
-        for trivial, original in assert_map.items():
-            with self.subTest(trivial=trivial, original=original):
+        for trivial_name, original in self._ASSERT_MAP:
+            trivial = getattr(self.kls, trivial_name)
+            with self.subTest(trivial=trivial_name, original=original):
                 with mock.patch.object(unittest.TestCase, original) as m:
                     # filename provided
-                    with mock.patch(
-                            'marbles.mixins.mixins.open', mock.mock_open()) as mo:
-                        mo.return_value = filemock
-
-                        trivial(self.filename, 10)
-                        mo.assert_called_with(self.filename)
-                        m.assert_called_with(10, 10, msg=None)
+                    trivial(self.filename, 10)
+                    mock_stat.assert_called_with(self.filename)
+                    m.assert_called_with(10, 10, msg=None)
 
-                        trivial(self.filename, 10, msg='override')
-                        mo.assert_called_with(self.filename)
-                        m.assert_called_with(10, 10, msg='override')
+                    trivial(self.filename, 10, msg='override')
+                    mock_stat.assert_called_with(self.filename)
+                    m.assert_called_with(10, 10, msg='override')
 
                     # file-like object provided
                     trivial(filemock, 10)
@@ -666,29 +826,26 @@ class TestFileMixins(unittest.TestCase):
 
         with mock.patch.object(unittest.TestCase, 'assertAlmostEqual') as m:
             # filename provided
-            with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as mo:
-                mo.return_value = filemock
-
-                self.kls.assertFileSizeAlmostEqual(self.filename, 10)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(10, 10, places=None, msg=None, delta=None)
-
-                self.kls.assertFileSizeAlmostEqual(self.filename,
-                                                   10,
-                                                   msg='override')
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(
-                        10, 10, places=None, msg='override', delta=None)
-
-                self.kls.assertFileSizeAlmostEqual(self.filename, 10, places=1)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(10, 10, places=1, msg=None, delta=None)
-
-                self.kls.assertFileSizeAlmostEqual(
-                        filename=self.filename, size=10, delta=1)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(
-                        10, 10, places=None, msg=None, delta=1)
+            self.kls.assertFileSizeAlmostEqual(self.filename, 10)
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(10, 10, places=None, msg=None, delta=None)
+
+            self.kls.assertFileSizeAlmostEqual(self.filename,
+                                               10,
+                                               msg='override')
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(
+                    10, 10, places=None, msg='override', delta=None)
+
+            self.kls.assertFileSizeAlmostEqual(self.filename, 10, places=1)
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(10, 10, places=1, msg=None, delta=None)
+
+            self.kls.assertFileSizeAlmostEqual(
+                    filename=self.filename, size=10, delta=1)
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(
+                    10, 10, places=None, msg=None, delta=1)
 
             # file-like object provided
             self.kls.assertFileSizeAlmostEqual(filemock, 10)
@@ -706,31 +863,28 @@ class TestFileMixins(unittest.TestCase):
 
         with mock.patch.object(unittest.TestCase, 'assertNotAlmostEqual') as m:
             # filename provided
-            with mock.patch('marbles.mixins.mixins.open', mock.mock_open()) as mo:
-                mo.return_value = filemock
-
-                self.kls.assertFileSizeNotAlmostEqual(self.filename, 10)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(10, 10, places=None, msg=None, delta=None)
-
-                self.kls.assertFileSizeNotAlmostEqual(self.filename,
-                                                      10,
-                                                      msg='override')
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(
-                        10, 10, places=None, msg='override', delta=None)
-
-                self.kls.assertFileSizeNotAlmostEqual(self.filename,
-                                                      10,
-                                                      places=1)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(10, 10, places=1, msg=None, delta=None)
-
-                self.kls.assertFileSizeNotAlmostEqual(self.filename,
-                                                      10,
-                                                      delta=1)
-                mo.assert_called_with(self.filename)
-                m.assert_called_with(10, 10, places=None, msg=None, delta=1)
+            self.kls.assertFileSizeNotAlmostEqual(self.filename, 10)
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(10, 10, places=None, msg=None, delta=None)
+
+            self.kls.assertFileSizeNotAlmostEqual(self.filename,
+                                                  10,
+                                                  msg='override')
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(
+                    10, 10, places=None, msg='override', delta=None)
+
+            self.kls.assertFileSizeNotAlmostEqual(self.filename,
+                                                  10,
+                                                  places=1)
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(10, 10, places=1, msg=None, delta=None)
+
+            self.kls.assertFileSizeNotAlmostEqual(self.filename,
+                                                  10,
+                                                  delta=1)
+            mock_stat.assert_called_with(self.filename)
+            m.assert_called_with(10, 10, places=None, msg=None, delta=1)
 
             # file-like object provided
             self.kls.assertFileSizeNotAlmostEqual(filemock, 10)
@@ -746,22 +900,105 @@ class TestFileMixins(unittest.TestCase):
             self.kls.assertFileSizeNotAlmostEqual(filemock, 10, delta=1)
             m.assert_called_with(10, 10, places=None, msg=None, delta=1)
 
+    def test_assert_file_size_directory(self):
+        '''Is a directory rejected instead of reporting its entry size?'''
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # open() raises IsADirectoryError on POSIX and
+            # PermissionError on Windows
+            with self.assertRaises(OSError):
+                self.kls.assertFileSizeEqual(tmpdir, os.stat(tmpdir).st_size)
+
+            with self.assertRaises(OSError):
+                self.kls.assertFileSizeGreaterEqual(tmpdir, 0)
+
+    def test_assert_file_sizes_equal(self):
+        filemock = mock.MagicMock()
+        filemock.name = 'other-file.csv'
+        filemock.tell.return_value = 20
+
+        with mock.patch.object(os, 'stat') as mo:
+            mo.return_value.st_mode = stat.S_IFREG
+            mo.return_value.st_size = self.filesize
+
+            self.kls.assertFileSizesEqual({self.filename: 10, filemock: 20})
+            mo.assert_called_once_with(self.filename)
+
+            msg = 'File sizes differ: %s (10 != 11), other-file.csv (20 != 21)' % self.filename
+            with self.assertRaises(AssertionError) as e:
+                self.kls.assertFileSizesEqual({self.filename: 11,
+                                               filemock: 21})
+            self.assertEqual(e.exception.args[0], msg)
+
+            over_msg = self._formatMessage('override', msg)
+            with self.assertRaises(AssertionError) as e:
+                self.kls.assertFileSizesEqual({self.filename: 11,
+                                               filemock: 21},
+                                              msg='override')
+            self.assertEqual(e.exception.args[0], over_msg)
+
+        # A file-like object without a name is described by its repr
+        nameless = io.BytesIO(b'x' * 5)
+        msg = 'File sizes differ: %r (5 != 6)' % nameless
+        with self.assertRaises(AssertionError) as e:
+            self.kls.assertFileSizesEqual({nameless: 6})
+        self.assertEqual(e.exception.args[0], msg)
+
+    @mock.patch.object(mixins, '_SCANDIR_SIZES', True)
+    def test_assert_file_sizes_equal_scandir(self):
+        '''Are directories with enough requested files scanned once?
+
+        The scandir path only runs on Windows, so this test forces it on
+        by patching _SCANDIR_SIZES; elsewhere it is the only coverage
+        that path gets.
+        '''
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sizes = {}
+            for i in range(mixins._SCANDIR_MIN_FILES):
+                fname = os.path.join(tmpdir, 'file-%d.csv' % i)
+                with open(fname, 'w') as f:
+                    f.write('x' * i)
+                sizes[fname] = i
+
+            # Enough files share a directory that it is read once
+            # instead of stat-ing each file
+            with mock.patch.object(os, 'scandir', wraps=os.scandir) as ms, \
+                    mock.patch.object(mixins.FileMixins,
+                                      '_get_file_size') as mg:
+                self.kls.assertFileSizesEqual(sizes)
+                ms.assert_called_once_with(tmpdir)
+                mg.assert_not_called()
+
+            fname = next(iter(sizes))
+            sizes[fname] += 1
+            msg = 'File sizes differ: %s (0 != 1)' % fname
+            with self.assertRaises(AssertionError) as e:
+                self.kls.assertFileSizesEqual(sizes)
+            self.assertEqual(e.exception.args[0], msg)
+
+            # Too few files in a directory to be worth reading it
+            sizes = dict(list(sizes.items())[1:])
+            with mock.patch.object(os, 'scandir') as ms:
+                self.kls.assertFileSizesEqual(sizes)
+                ms.assert_not_called()
+
 
 class TestCategoricalMixins(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         class TestCategorical(unittest.TestCase, mixins.CategoricalMixins): pass  # noqa: E701
 
-        setattr(self, 'kls', TestCategorical())
-        setattr(self, 'levels1', [1, 2, 3, 2, 1])
-        setattr(self, 'levels2', [1, 1, 2, 2, 3])
-        setattr(self, 'levels3', ['x', 'y', 'z'])
+        setattr(cls, 'kls', TestCategorical())
+        setattr(cls, 'levels1', [1, 2, 3, 2, 1])
+        setattr(cls, 'levels2', [1, 1, 2, 2, 3])
+        setattr(cls, 'levels3', ['x', 'y', 'z'])
 
-    def tearDown(self):
-        delattr(self, 'kls')
-        delattr(self, 'levels1')
-        delattr(self, 'levels2')
-        delattr(self, 'levels3')
+    @classmethod
+    def tearDownClass(cls):
+        delattr(cls, 'kls')
+        delattr(cls, 'levels1')
+        delattr(cls, 'levels2')
+        delattr(cls, 'levels3')
 
     def test_type_checking(self):
         '''Is an AssertionError raised if either argument is not iterable?'''
@@ -829,6 +1066,34 @@ class TestCategoricalMixins(unittest.TestCase):
                                                      [set([1, 2, 3])])
         self.assertEqual(e.exception.args[0], msg)
 
+        # only the second argument is unhashable
+        self.kls.assertCategoricalLevelsNotEqual({1, 2}, [1, [2]])
+
+        # sets are compared directly
+        self.kls.assertCategoricalLevelsEqual(
+                self.kls._WEEKDAYS_SET, list(reversed(self.kls.WEEKDAYS)))
+        self.kls.assertCategoricalLevelsNotEqual(self.kls._WEEKDAYS_SET,
+                                                 self.kls._WEEKDAYS_ABBR_SET)
+
+        # Series are compared on their values, not their index
+        series = pd.Series(['z', 'x', 'y', 'x'])
+        self.kls.assertCategoricalLevelsEqual(series, self.levels3)
+        self.kls.assertCategoricalLevelsEqual(self.levels3, series)
+        self.kls.assertCategoricalLevelsNotEqual(series, self.levels1)
+
+    def test_frozen_tables(self):
+        '''Does each table's frozenset match the table?'''
+        for name in ('WEEKDAYS', 'WEEKDAYS_ABBR', 'MONTHS', 'MONTHS_ABBR',
+                     'US_STATES', 'US_STATES_ABBR', 'US_TERRITORIES',
+                     'US_TERRITORIES_ABBR', 'CONTINENTS'):
+            with self.subTest(name=name):
+                table = getattr(self.kls, name)
+                frozen = getattr(self.kls, '_%s_SET' % name)
+                self.assertEqual(frozen, frozenset(table))
+
+        self.kls.assertCategoricalLevelIn('Ohio', self.kls._US_STATES_SET)
+        self.kls.assertCategoricalLevelNotIn('OH', self.kls._US_STATES_SET)
+
     def test_trivial_asserts(self):
         assert_map = {
             self.kls.assertCategoricalLevelIn: 'assertIn',
@@ -847,34 +1112,28 @@ class TestCategoricalMixins(unittest.TestCase):
 
 class TestDateTimeMixins(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         class TestDateTime(unittest.TestCase, mixins.DateTimeMixins): pass  # noqa: E701,E301
 
-        setattr(self, 'kls', TestDateTime())
-        setattr(self, 'tz', timezone.utc)
-        setattr(self, 'dt', datetime(2016, 1, 1, 1, 9, 0, tzinfo=self.tz))
-        setattr(self, 'pdates', [
-            datetime.today() - timedelta(7),
-            datetime.today() - timedelta(6),
-            datetime.today() - timedelta(5),
-            datetime.today() - timedelta(4),
-            datetime.today() - timedelta(3),
-            datetime.today() - timedelta(2),
-            datetime.today() - timedelta(1)
-        ])
-        setattr(self, 'fdates', [
-            datetime.today() + timedelta(7),
-            datetime.today() + timedelta(6),
-            datetime.today() + timedelta(5),
-            datetime.today() + timedelta(4),
-            datetime.today() + timedelta(3),
-            datetime.today() + timedelta(2),
-            datetime.today() + timedelta(1)
-        ])
+        setattr(cls, 'kls', TestDateTime())
+        setattr(cls, 'tz', timezone.utc)
+        setattr(cls, 'dt', datetime(2016, 1, 1, 1, 9, 0, tzinfo=cls.tz))
+
+    @classmethod
+    def tearDownClass(cls):
+        delattr(cls, 'kls')
+        delattr(cls, 'tz')
+        delattr(cls, 'dt')
+
+    def setUp(self):
+        today = datetime.today()
+        setattr(self, 'pdates',
+                [today - timedelta(days) for days in range(7, 0, -1)])
+        setattr(self, 'fdates',
+                [today + timedelta(days) for days in range(7, 0, -1)])
 
     def tearDown(self):
-        delattr(self, 'kls')
-        delattr(self, 'dt')
         delattr(self, 'pdates')
         delattr(self, 'fdates')
 
@@ -911,73 +1170,56 @@ class TestDateTimeMixins(unittest.TestCase):
             self.kls.assertDateTimesAfter(self.pdates, 1)
         self.assertEqual(e.exception.args[0], msg)
 
-        # assertions that require an iterable and a timedelta
-        methods = [
-            self.kls.assertDateTimesFrequencyEqual,
-            self.kls.assertDateTimesLagEqual,
-            self.kls.assertDateTimesLagLess,
-            self.kls.assertDateTimesLagLessEqual
+        not_iterable = 'First argument is not iterable'
+        not_timedelta = 'Second argument is not a timedelta object'
+        not_datetime = 'First argument is not a datetime object'
+        not_timezone = 'Second argument is not a timezone object'
+        cases = [
+            # assertions that require an iterable and a timedelta
+            (self.kls.assertDateTimesFrequencyEqual,
+             (1, timedelta(2)), not_iterable),
+            (self.kls.assertDateTimesFrequencyEqual,
+             ([1, 2, 3], 2), not_timedelta),
+            (self.kls.assertDateTimesLagEqual,
+             (1, timedelta(2)), not_iterable),
+            (self.kls.assertDateTimesLagEqual, ([1, 2, 3], 2), not_timedelta),
+            (self.kls.assertDateTimesLagLess, (1, timedelta(2)), not_iterable),
+            (self.kls.assertDateTimesLagLess, ([1, 2, 3], 2), not_timedelta),
+            (self.kls.assertDateTimesLagLessEqual,
+             (1, timedelta(2)), not_iterable),
+            (self.kls.assertDateTimesLagLessEqual,
+             ([1, 2, 3], 2), not_timedelta),
+            # assertions that require an iterable
+            (self.kls.assertDateTimesPast, (1,), not_iterable),
+            (self.kls.assertDateTimesFuture, (1,), not_iterable),
+            (self.kls.assertDateTimesBefore, (1, [1]), not_iterable),
+            (self.kls.assertDateTimesAfter, (1, [1]), not_iterable),
+            # assertions that require a datetime (and a timezone)
+            (self.kls.assertTimeZoneIsNone, (10,), not_datetime),
+            (self.kls.assertTimeZoneIsNotNone, (date.today(),), not_datetime),
+            (self.kls.assertTimeZoneEqual, (10, timezone.utc), not_datetime),
+            (self.kls.assertTimeZoneEqual,
+             (datetime.now(), 'UTC'), not_timezone),
+            (self.kls.assertTimeZoneNotEqual,
+             (10, timezone.utc), not_datetime),
+            (self.kls.assertTimeZoneNotEqual,
+             (datetime.now(), 'UTC'), not_timezone),
         ]
 
-        for method in methods:
-            with self.subTest(method=method):
-                msg = ('First argument is not iterable',
-                       'Second argument is not a timedelta object')
-                with self.assertRaises(TypeError) as e:
-                    method(1, timedelta(2))
-                self.assertTrue(e.exception.args[0].endswith(msg[0]))
-
+        for method, args, msg in cases:
+            with self.subTest(method=method, args=args):
                 with self.assertRaises(TypeError) as e:
-                    method([1, 2, 3], 2)
-                self.assertTrue(e.exception.args[0].endswith(msg[1]))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertDateTimesPast(1)
-        self.assertTrue(e.exception.args[0].endswith(msg[0]))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertDateTimesFuture(1)
-        self.assertTrue(e.exception.args[0].endswith(msg[0]))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertDateTimesBefore(1, [1])
-        self.assertTrue(e.exception.args[0].endswith(msg[0]))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertDateTimesAfter(1, [1])
-        self.assertTrue(e.exception.args[0].endswith(msg[0]))
-
-        msg = 'First argument is not a datetime object'
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertTimeZoneIsNone(10)
-        self.assertTrue(e.exception.args[0].endswith(msg))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertTimeZoneIsNotNone(date.today())
-        self.assertTrue(e.exception.args[0].endswith(msg))
-
-        msg = ('First argument is not a datetime object',
-               'Second argument is not a timezone object')
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertTimeZoneEqual(10, timezone.utc)
-        self.assertTrue(e.exception.args[0].endswith(msg[0]))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertTimeZoneEqual(datetime.now(), 'UTC')
-        self.assertTrue(e.exception.args[0].endswith(msg[1]))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertTimeZoneNotEqual(10, timezone.utc)
-        self.assertTrue(e.exception.args[0].endswith(msg[0]))
-
-        with self.assertRaises(TypeError) as e:
-            self.kls.assertTimeZoneNotEqual(datetime.now(), 'UTC')
-        self.assertTrue(e.exception.args[0].endswith(msg[1]))
+                    method(*args)
+                self.assertTrue(e.exception.args[0].endswith(msg))
 
     def test_before(self):
         # sequence of targets provided
         self.kls.assertDateTimesBefore(self.pdates, self.fdates)
 
+        # one-shot iterators are fine too
+        self.kls.assertDateTimesBefore(iter(self.pdates), iter(self.fdates))
+        self.kls.assertDateTimesPast(x for x in self.pdates)
+
         self.kls.assertDateTimesBefore(self.pdates, self.pdates, strict=False)
         with self.assertRaises(AssertionError):
             self.kls.assertDateTimesBefore(self.pdates, self.pdates)
@@ -1036,6 +1278,10 @@ class TestDateTimeMixins(unittest.TestCase):
         # sequence of targets provided
         self.kls.assertDateTimesAfter(self.fdates, self.pdates)
 
+        # one-shot iterators are fine too
+        self.kls.assertDateTimesAfter(iter(self.fdates), iter(self.pdates))
+        self.kls.assertDateTimesFuture(x for x in self.fdates)
+
         self.kls.assertDateTimesAfter(self.pdates, self.pdates, strict=False)
         with self.assertRaises(AssertionError):
             self.kls.assertDateTimesAfter(self.fdates, self.fdates)
@@ -1089,6 +1335,34 @@ class TestDateTimeMixins(unittest.TestCase):
             self.kls.assertDateTimesAfter(self.pdates, target, strict=False)
         self.assertEqual(e.exception.args[0], msg % (self.pdates, target))
 
+    def test_before_after_array(self):
+        '''Are numpy and pandas datetime arrays compared elementwise?'''
+        target = datetime.now()
+        for kind in (np.array, pd.Series, pd.Index):
+            with self.subTest(kind=kind):
+                pdates = kind(self.pdates, dtype='datetime64[ns]')
+                fdates = kind(self.fdates, dtype='datetime64[ns]')
+
+                self.kls.assertDateTimesBefore(pdates, target)
+                self.kls.assertDateTimesBefore(pdates, fdates)
+                self.kls.assertDateTimesBefore(pdates, pdates, strict=False)
+                self.kls.assertDateTimesAfter(fdates, pd.Timestamp(target))
+                self.kls.assertDateTimesAfter(fdates, pdates)
+                self.kls.assertDateTimesAfter(fdates, fdates, strict=False)
+
+                with self.assertRaises(AssertionError):
+                    self.kls.assertDateTimesBefore(fdates, target)
+                with self.assertRaises(AssertionError):
+                    self.kls.assertDateTimesBefore(pdates, pdates)
+                with self.assertRaises(AssertionError):
+                    self.kls.assertDateTimesAfter(pdates, fdates)
+
+                # Null datetimes never compare True
+                with self.assertRaises(AssertionError):
+                    self.kls.assertDateTimesBefore(
+                            kind([None, *self.pdates], dtype='datetime64[ns]'),
+                            target)
+
     @mock.patch.object(mixins.DateTimeMixins, 'assertDateTimesBefore')
     def test_past(self, mock_assert_before):
         target = date.today()
@@ -1141,10 +1415,50 @@ class TestDateTimeMixins(unittest.TestCase):
         self.kls.assertDateTimesFrequencyEqual(self.fdates,
                                                timedelta(hours=-24))
 
-        msg = 'unexpected frequencies found in %s'
+        msg = 'unexpected frequency at position %d in %s'
         with self.assertRaises(AssertionError) as e:
             self.kls.assertDateTimesFrequencyEqual(self.pdates, timedelta(2))
-        self.assertEqual(e.exception.args[0], msg % (self.pdates,))
+        self.assertEqual(e.exception.args[0], msg % (1, self.pdates))
+
+        pdates = tuple(self.pdates)
+        with self.assertRaises(AssertionError) as e:
+            self.kls.assertDateTimesFrequencyEqual(pdates, timedelta(2))
+        self.assertEqual(e.exception.args[0], msg % (1, pdates))
+
+        # The first mismatch is reported
+        pdates = self.pdates[:2] + self.pdates[3:]
+        with self.assertRaises(AssertionError) as e:
+            self.kls.assertDateTimesFrequencyEqual(pdates, timedelta(1))
+        self.assertEqual(e.exception.args[0], msg % (2, pdates))
+
+        # Null dates are never at the expected frequency
+        for null in (None, float('nan'), pd.NaT):
+            with self.subTest(null=null):
+                pdates = self.pdates + [null]
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertDateTimesFrequencyEqual(pdates,
+                                                           timedelta(1))
+                self.assertEqual(e.exception.args[0],
+                                 msg % (len(self.pdates), pdates))
+
+        pdates = self.pdates[:1] + [float('nan')] + self.pdates[2:]
+        with self.assertRaises(AssertionError) as e:
+            self.kls.assertDateTimesFrequencyEqual(pdates, timedelta(1))
+        self.assertEqual(e.exception.args[0], msg % (1, pdates))
+
+        for kind in (np.array, pd.Series, pd.Index):
+            with self.subTest(kind=kind):
+                pdates = kind(self.pdates, dtype='datetime64[ns]')
+                self.kls.assertDateTimesFrequencyEqual(pdates, timedelta(1))
+                with self.assertRaises(AssertionError):
+                    self.kls.assertDateTimesFrequencyEqual(pdates,
+                                                           timedelta(2))
+                pdates = kind(self.pdates + [None], dtype='datetime64[ns]')
+                with self.assertRaises(AssertionError) as e:
+                    self.kls.assertDateTimesFrequencyEqual(pdates,
+                                                           timedelta(1))
+                self.assertEqual(e.exception.args[0],
+                                 msg % (len(self.pdates), pdates))
 
     def test_lag(self):
         with mock.patch.object(unittest.TestCase, 'assertEqual') as m:
@@ -1153,8 +1467,8 @@ class TestDateTimeMixins(unittest.TestCase):
             self.kls.assertDateTimesLagEqual(self.pdates, diff)
             self.assertTrue(m.called)
 
-        with mock.patch.object(unittest.TestCase, 'assertEqual') as m:
             # dates provided
+            m.reset_mock()
             diff = date.today() - max(self.pdates).date()
             self.kls.assertDateTimesLagEqual(
                     [x.date() for x in self.pdates], diff)
@@ -1168,8 +1482,8 @@ class TestDateTimeMixins(unittest.TestCase):
             self.kls.assertDateTimesLagLess(self.pdates, timedelta(2))
             self.assertTrue(m.called)
 
-        with mock.patch.object(unittest.TestCase, 'assertLess') as m:
             # dates provided
+            m.reset_mock()
             diff = date.today() - max(self.pdates).date()
             self.kls.assertDateTimesLagLess(
                     [x.date() for x in self.pdates], timedelta(2))
@@ -1183,8 +1497,8 @@ class TestDateTimeMixins(unittest.TestCase):
             self.kls.assertDateTimesLagLessEqual(self.pdates, timedelta(2))
             self.assertTrue(m.called)
 
-        with mock.patch.object(unittest.TestCase, 'assertLessEqual') as m:
             # dates provided
+            m.reset_mock()
             diff = date.today() - max(self.pdates).date()
             self.kls.assertDateTimesLagLessEqual(
                     [x.date() for x in self.pdates], timedelta(2))
@@ -1223,5 +1537,66 @@ class TestDateTimeMixins(unittest.TestCase):
             m.assert_called_with(self.dt.tzinfo, self.tz, msg='override')
 
 
+class TestIterability(unittest.TestCase):
+    '''Are objects that are only iterable through __getitem__ accepted?'''
+
+    class GetItemOnly(object):
+
+        def __init__(self, items):
+            self.items = items
+
+        def __len__(self):
+            return len(self.items)
+
+        def __getitem__(self, idx):
+            return self.items[idx]
+
+    @classmethod
+    def setUpClass(cls):
+        class TestAll(unittest.TestCase, mixins.MonotonicMixins,
+                      mixins.UniqueMixins, mixins.CategoricalMixins,
+                      mixins.DateTimeMixins):
+            pass
+
+        setattr(cls, 'kls', TestAll())
+
+    @classmethod
+    def tearDownClass(cls):
+        delattr(cls, 'kls')
+
+    def test_get_item_only(self):
+        self.kls.assertMonotonicIncreasing(self.GetItemOnly([1, 2, 3]))
+        self.kls.assertUnique(self.GetItemOnly([1, 2, 3]))
+        self.kls.assertCategoricalLevelIn(1, self.GetItemOnly([1, 2, 3]))
+        self.kls.assertCategoricalLevelsEqual(self.GetItemOnly([1, 2]),
+                                              [2, 1])
+
+        past = datetime.now() - timedelta(1)
+        self.kls.assertDateTimesPast(self.GetItemOnly([past]))
+        self.kls.assertDateTimesBefore(self.GetItemOnly([past]),
+                                       self.GetItemOnly([datetime.now()]))
+
+    def test_not_iterable(self):
+        for method in (self.kls.assertMonotonicIncreasing,
+                       self.kls.assertUnique,
+                       self.kls.assertDateTimesPast):
+            with self.subTest(method=method):
+                with self.assertRaises(TypeError) as e:
+                    method(1)
+                self.assertTrue(e.exception.args[0].endswith(
+                    'First argument is not iterable'))
+
+
+class TestImport(unittest.TestCase):
+
+    def test_no_heavy_imports(self):
+        '''Importing the mixins must not import numpy or pandas'''
+        code = ('import sys, marbles.mixins.mixins; '
+                'print(sorted({"numpy", "pandas"} & set(sys.modules)))')
+        out = subprocess.run([sys.executable, '-c', code],
+                             capture_output=True, check=True, text=True)
+        self.assertEqual(out.stdout.strip(), '[]')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+import hashlib
 import os
 from pathlib import Path
 import shutil
@@ -25,24 +26,72 @@ else:
 SUPPORTED_PYTHONS = ('3.9', '3.10', '3.11', '3.12')
 MIN_SUPPORTED_PYTHON = '3.9'
 
+# Files whose changes require the editable installs to be refreshed. Source
+# changes are picked up by the editable installs on their own.
+
+MARBLES_METADATA = [
+    f'marbles/{subpackage}/{name}'
+    for subpackage in ('core', 'mixins')
+    for name in ('pyproject.toml', 'setup.cfg', 'setup.py', 'classifiers.txt',
+                 f'marbles/{subpackage}/VERSION')
+]
+
 
 # Helper session for integrating well with pip-sync.
 
+def _fingerprint(paths):
+    '''Hash the names and contents of the given files.'''
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode())
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def _installs_enabled(session):
+    '''Return whether nox runs install commands in this session.
+
+    ``nox -R`` and ``--no-install`` skip them in a reused virtualenv.
+    ``session.install`` doesn't say whether it ran, but
+    ``session.run_always`` returns None for a command it skipped.
+    '''
+    return session.run_always('python', '-c', '', silent=True) is not None
+
+
 def sync_session(*envs, install_marbles=False, **kwargs):
     '''Nox session decorator that uses pip-sync to manage dependencies.'''
     def decorator(f):
         @nox.session(**kwargs)
         @wraps(f)
         def wrapper(session: nox.Session, *args, **kwargs):
-            session.install('pip-tools')
             concrete_reqs = [f'requirements/{env}.txt' for env in envs]
             if install_marbles and sys.platform == 'win32':
                 concrete_reqs.append('requirements/windows.txt')
-            session.run_always('pip-sync', *concrete_reqs)
 
+            # A reused virtualenv that was last synced against the same
+            # requirements doesn't need pip-sync to rescan it.
+            fingerprint = _fingerprint(concrete_reqs)
+            marker = Path(session.virtualenv.location, '.reqs-hash')
+            synced = False
+            if not marker.is_file() or marker.read_text() != fingerprint:
+                session.install('pip-tools')
+                # Only record a sync that actually happened: run_always
+                # returns None when nox skips installs
+                if session.run_always('pip-sync', *concrete_reqs) is not None:
+                    marker.write_text(fingerprint)
+                    synced = True
+
+            # pip-sync uninstalls marbles, so reinstall after every sync, and
+            # otherwise only when the packaging metadata has changed.
             if install_marbles:
-                session.install('-e', 'marbles/core', '-e', 'marbles/mixins',
-                                '--no-deps')
+                fingerprint = _fingerprint(MARBLES_METADATA)
+                marker = Path(session.virtualenv.location, '.marbles-hash')
+                if (synced or not marker.is_file()
+                        or marker.read_text() != fingerprint):
+                    session.install('-e', 'marbles/core',
+                                    '-e', 'marbles/mixins', '--no-deps')
+                    if _installs_enabled(session):
+                        marker.write_text(fingerprint)
             return f(session, *args, **kwargs)
 
         return wrapper
@@ -54,9 +103,17 @@ def sync_session(*envs, install_marbles=False, **kwargs):
 @sync_session('base', python=SUPPORTED_PYTHONS, install_marbles=True)
 def test(session: nox.Session):
     '''Run tests, without coverage.'''
-    for subpackage in ('marbles/core', 'marbles/mixins'):
-        with session.chdir(subpackage):
-            session.run('python', '-m', 'unittest', 'discover', 'tests')
+    # The suites don't share state, so run them side by side. Discovery is
+    # rooted at each subpackage instead of chdir-ing into it, since the
+    # working directory is shared between threads.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(
+            lambda subpackage: session.run(
+                'python', '-m', 'unittest', 'discover',
+                '-s', f'{subpackage}/tests', '-t', subpackage
+            ),
+            ('marbles/core', 'marbles/mixins')
+        ))
 
 
 @sync_session('coverage', python=SUPPORTED_PYTHONS, install_marbles=True,
@@ -141,25 +198,34 @@ def pip_compile(session: nox.Session):
     session.install('pip-tools')
     args = ['--generate-hashes']
 
-    for subpackage in ('marbles/core', 'marbles/mixins'):
-        with session.chdir(subpackage):
-            session.run('pip-compile', *args, *session.posargs)
-
+    # Every pip-compile call is independent, so run them all at once. The
+    # subpackages are compiled by path rather than by chdir, since the
+    # working directory is shared between threads.
+    subpackages = ('marbles/core', 'marbles/mixins')
+    jobs = [
+        ['--output-file', f'{subpackage}/requirements.txt',
+         f'{subpackage}/pyproject.toml']
+        for subpackage in subpackages
+    ]
     reqs_dir = Path('requirements')
-    infiles = [
-        req for req in reqs_dir.glob('*.in')
+    jobs.extend(
+        [str(req)] for req in reqs_dir.glob('*.in')
         if req.stem != 'windows' or sys.platform == 'win32'
-    ]
-    with ThreadPoolExecutor() as executor:
-        executor.map(
-            lambda infile: session.run(
-                'pip-compile', *args, *session.posargs, str(infile)
+    )
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the results so that a failed run fails the session
+        list(executor.map(
+            lambda job: session.run(
+                'pip-compile', *args, *session.posargs, *job
             ),
-            infiles
-        )
+            jobs
+        ))
 
     # Remove after https://github.com/jazzband/pip-tools/pull/1650
-    for f in reqs_dir.glob('*.txt'):
+    outfiles = [Path(subpackage, 'requirements.txt')
+                for subpackage in subpackages]
+    for f in [*outfiles, *reqs_dir.glob('*.txt')]:
         content = f.read_text()
         content = content.replace(f'{Path.cwd()}/', '')
         f.write_text(content)